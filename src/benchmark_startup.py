@@ -0,0 +1,71 @@
+import sys
+import time
+import subprocess
+import argparse
+from pathlib import Path
+
+from config import Config
+
+##############################################################################################################################
+
+# 启动参数解析
+parser = argparse.ArgumentParser(description = "启动耗时测试：导入耗时与首帧耗时")
+parser.add_argument("--configPath", help = "配置路径", type = str, default = Path(__file__).parent.parent.joinpath('config.json').as_posix())
+parser.add_argument("--source", help = "用于测量首帧耗时的输入源（不指定则只测量导入耗时）", type = str, default = None)
+parser.add_argument("--repeat", help = "导入耗时的测量次数（每次在新进程中进行）", type = int, default = 3)
+
+##############################################################################################################################
+
+# 界面启动时立即导入的模块与延后到后台导入的模块
+IMPORTS = {
+    'gui': "import PySide6.QtWidgets, QEasyWidgets.Components, utils",
+    'core': "import core",
+}
+
+
+def measure_import(statement):
+    """在新进程中测量导入耗时(s)"""
+    code = f"import time; start = time.perf_counter(); {statement}; print(time.perf_counter() - start)"
+    output = subprocess.check_output([sys.executable, "-c", code], cwd = Path(__file__).parent, text = True)
+    return float(output.strip().splitlines()[-1])
+
+
+def measure_first_frame(configPath, source):
+    """测量从导入深度学习库到第一帧处理完成的耗时(s)"""
+    times = {}
+    start = time.perf_counter()
+    from core import PlatePipeline
+    times['import'] = time.perf_counter() - start
+
+    config = Config(configPath)
+    model_paths = config.get_model_paths()
+    pipeline = PlatePipeline(
+        Path(configPath).parent.joinpath(model_paths['yolo_model']).as_posix(),
+        Path(configPath).parent.joinpath(model_paths['lprnet_model']).as_posix(),
+        model_paths.get('lprnet_device')
+    )
+    times['model_load'] = time.perf_counter() - start - times['import']
+
+    def on_frame(frame):
+        times.setdefault('first_frame', time.perf_counter() - start)
+        pipeline.stop()
+    pipeline.on_frame = on_frame
+    pipeline.run(source)
+    return times
+
+##############################################################################################################################
+
+def main(args):
+    for name, statement in IMPORTS.items():
+        durations = [measure_import(statement) for _ in range(args.repeat)]
+        print(f"导入耗时[{name}]：首次 {durations[0]:.3f}s，最快 {min(durations):.3f}s")
+    if args.source:
+        times = measure_first_frame(args.configPath, args.source)
+        print("首帧耗时：" + "，".join(f"{name} {seconds:.3f}s" for name, seconds in times.items()))
+
+##############################################################################################################################
+
+if __name__ == '__main__':
+    main(parser.parse_args())
+
+##############################################################################################################################
@@ -19,7 +19,9 @@ class Config:
             "refresh_rate": 1000  # 界面刷新率（毫秒）
         },
         "data": {
-            "records_file": "parking_records.csv"
+            "records_file": "parking_records.csv",
+            "backend": "csv",  # 存储后端（csv/sqlite）
+            "database_file": "parking_records.db"
         }
     }
 
@@ -92,9 +94,12 @@ class Config:
 
     def get_model_paths(self):
         """
-        获取模型路径
+        获取模型路径（lprnet_precision为int8时，lprnet_model为量化后的模型lprnet_int8_model）
         """
-        return self.get('models')
+        model_paths = dict(self.get('models'))
+        if model_paths.get('lprnet_precision') == 'int8' and model_paths.get('lprnet_int8_model'):
+            model_paths['lprnet_model'] = model_paths['lprnet_int8_model']
+        return model_paths
 
 ##############################################################################################################################
 
@@ -1,2 +1,13 @@
-from .yolo import *
-from .paint_trail import *
\ No newline at end of file
+from .models import *
+from .pipeline import *
+from .streams import *
+from .stages import *
+from .capture import *
+from .paint_trail import *
+from .display import *
+from .results import *
+try:
+    from .yolo import *
+except ModuleNotFoundError as e: # 无界面环境（未安装PySide6）
+    if e.name != 'PySide6':
+        raise
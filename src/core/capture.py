@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+import cv2
+
+
+class FrameGrabber:
+    """
+    实时源（摄像头索引、RTSP/HTTP流）的低延迟抓帧器
+    后台线程持续读取且只保留最新的一帧，断线后按指数退避自动重连
+    传入resume_event时，事件未置位（暂停）期间释放摄像头/视频流、不读取也不解码，继续后重新打开
+    """
+    def __init__(self,
+        source,
+        min_backoff: float = 0.5,
+        max_backoff: float = 10.,
+        resume_event: threading.Event = None
+    ):
+        self.source = int(source) if str(source).isdigit() else source
+        self.min_backoff = min_backoff # 首次重连等待时间(s)
+        self.max_backoff = max_backoff # 最长重连等待时间(s)
+        self.resume_event = resume_event # 未暂停时置位（None为不支持暂停）
+
+        # 视频流状态
+        self.connected = False # 是否已连接
+        self.reconnects = 0 # 重连次数
+        self.grabbed = 0 # 读取的帧数
+        self.dropped = 0 # 未被取走就被覆盖的帧数
+        self.fps = 0. # 读取帧率
+        self.last_frame_time = None # 最近一帧的读取时间
+
+        self._frame = None
+        self._seq = 0 # 最新帧的序号
+        self._read_seq = 0 # 已取走的帧序号
+        self._cond = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name=f'grabber-{source}', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """停止读取并唤醒等待中的read"""
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+    @property
+    def stopped(self):
+        return self._stop_event.is_set()
+
+    @property
+    def paused(self):
+        return self.resume_event is not None and not self.resume_event.is_set()
+
+    def _wait_resumed(self):
+        """暂停时阻塞到继续或停止（每0.5s检查一次是否已停止）"""
+        while self.paused and not self.stopped:
+            self.resume_event.wait(0.5)
+
+    def _open(self):
+        cap = cv2.VideoCapture(self.source)
+        if not cap.isOpened():
+            cap.release()
+            return None
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1) # 尽量减少驱动层缓冲
+        return cap
+
+    def _loop(self):
+        backoff = self.min_backoff
+        while not self.stopped:
+            self._wait_resumed()
+            if self.stopped:
+                break
+            cap = self._open()
+            if cap is not None:
+                self.connected = True
+                backoff = self.min_backoff
+                while not self.stopped and not self.paused:
+                    ret, frame = cap.read()
+                    if not ret:
+                        self.connected = False
+                        break
+                    self._publish(frame)
+                cap.release() # 暂停时释放设备（摄像头关闭，不占用CPU）
+                if self.paused:
+                    continue
+            self.connected = False
+            if self.stopped:
+                break
+            # 断线重连（指数退避）
+            self._stop_event.wait(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+            self.reconnects += 1
+
+    def _publish(self, frame):
+        """替换最新帧"""
+        now = time.time()
+        with self._cond:
+            if self._seq > self._read_seq:
+                self.dropped += 1
+            self._frame = frame
+            self._seq += 1
+            self._cond.notify_all()
+        if self.last_frame_time is not None:
+            fps = 1 / max(now - self.last_frame_time, 1e-6)
+            self.fps = fps if self.fps == 0 else 0.9 * self.fps + 0.1 * fps
+        self.last_frame_time = now
+        self.grabbed += 1
+
+    def read(self, timeout=None):
+        """取最新的一帧（阻塞到有新帧），超时或已停止时返回None"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > self._read_seq or self.stopped, timeout)
+            if self._seq == self._read_seq:
+                return None
+            self._read_seq = self._seq
+            return self._frame
+
+    def health(self):
+        """视频流健康状态"""
+        return {
+            'connected': self.connected,
+            'paused': self.paused,
+            'reconnects': self.reconnects,
+            'grabbed': self.grabbed,
+            'dropped': self.dropped,
+            'fps': round(self.fps, 2),
+            'stale': round(time.time() - self.last_frame_time, 3) if self.last_frame_time is not None else None,
+        }
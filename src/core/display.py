@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+
+import cv2
+import numpy as np
+
+
+def fit_image(img, size):
+    """
+    按显示区域大小等比例缩放，并转换为RGB（工作线程中完成，GUI线程只需绘制）
+    size为(宽, 高)，无效时保持原尺寸
+    """
+    ih, iw = img.shape[:2]
+    w, h = size
+    if w > 0 and h > 0:
+        scale = min(w / iw, h / ih)
+        nw, nh = max(int(iw * scale), 1), max(int(ih * scale), 1)
+        if (nw, nh) != (iw, ih):
+            img = cv2.resize(img, (nw, nh), interpolation=cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR)
+    if img.ndim == 2:
+        return np.ascontiguousarray(cv2.cvtColor(img, cv2.COLOR_GRAY2RGB))
+    return np.ascontiguousarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+
@@ -1,5 +1,6 @@
 import torch.nn as nn
 import torch
+from typing import List
 
 
 CHARS = ['jing', 'hu', 'jin', 'yu', 'yi', 'jin', 'meng', 'liao', 'ji', 'hei',
@@ -66,22 +67,26 @@ class LPRNet(nn.Module):
             # nn.Conv2d(in_channels=self.class_num, out_channels=self.lpr_max_len+1, kernel_size=3, stride=2),
             # nn.ReLU(),
         )
+        # 各保留特征图的池化层（构建一次，不在forward中重复创建；无参数，不影响权重文件）
+        self.global_pools = nn.ModuleList([
+            nn.AvgPool2d(kernel_size=5, stride=5),
+            nn.AvgPool2d(kernel_size=5, stride=5),
+            nn.AvgPool2d(kernel_size=(4, 10), stride=(4, 2)),
+            nn.Identity(),
+        ])
 
     def forward(self, x):
-        keep_features = list()
-        for i, layer in enumerate(self.backbone.children()):
+        keep_features: List[torch.Tensor] = []
+        for i, layer in enumerate(self.backbone):
             x = layer(x)
             if i in [2, 6, 13, 22]: # [2, 4, 8, 11, 22]
                 keep_features.append(x)
 
-        global_context = list()
-        for i, f in enumerate(keep_features):
-            if i in [0, 1]:
-                f = nn.AvgPool2d(kernel_size=5, stride=5)(f)
-            if i in [2]:
-                f = nn.AvgPool2d(kernel_size=(4, 10), stride=(4, 2))(f)
-            f_pow = torch.pow(f, 2)
-            f_mean = torch.mean(f_pow)
+        global_context: List[torch.Tensor] = []
+        for i, pool in enumerate(self.global_pools):
+            f = pool(keep_features[i])
+            # 按样本归一化（对整个批次取均值会使结果依赖于同批次的其他车牌）
+            f_mean = torch.mean(torch.pow(f, 2), dim=(1, 2, 3), keepdim=True)
             f = torch.div(f, f_mean)
             global_context.append(f)
 
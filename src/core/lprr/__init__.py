@@ -1 +1,10 @@
-from .LPRNet import *
\ No newline at end of file
+from .LPRNet import *
+from .decoder import *
+from .backends import *
+from .quantize import *
+from .preprocess import *
+from .recognizer import *
+from .batcher import *
+from .cache import *
+from .voting import *
+from .reader import *
\ No newline at end of file
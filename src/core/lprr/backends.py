@@ -0,0 +1,109 @@
+import os
+import numpy as np
+import torch
+from typing import Optional, Union
+
+from .LPRNet import CHARS, build_lprnet
+
+
+def load_lprnet(model_path: str, device: Optional[Union[str, torch.device]] = None):
+    """构建LPRNet并加载权重（推理模式）"""
+    model = build_lprnet(lpr_max_len=8, phase=False, class_num=len(CHARS), dropout_rate=0.5)
+    model.load_state_dict(torch.load(model_path, map_location=device or 'cpu'))
+    model.to(device or 'cpu')
+    model.eval()
+    return model
+
+
+class TorchBackend:
+    """PyTorch推理后端"""
+    name = 'torch'
+
+    def __init__(self, model_path: str, device: Optional[Union[str, torch.device]] = None):
+        self.device = torch.device(device) if device is not None else torch.device("cuda:0" if torch.cuda.is_available() else "cpu")
+        self.model = load_lprnet(model_path, self.device)
+
+    @torch.inference_mode()
+    def __call__(self, ims: Union[np.ndarray, torch.Tensor]):
+        """前向推理，输入(N,3,24,94)，返回[N, 68, 18]的logits"""
+        ims = torch.as_tensor(ims)
+        return self.model(ims.to(self.device, non_blocking=ims.is_pinned())).cpu().numpy() # 锁页内存异步拷贝
+
+
+class ONNXBackend:
+    """ONNX Runtime推理后端（需安装onnxruntime）"""
+    name = 'onnxruntime'
+
+    def __init__(self, model_path: str, device: Optional[str] = None):
+        import onnxruntime as ort
+        if device is not None and str(device).startswith('cuda'):
+            providers = ['CUDAExecutionProvider', 'CPUExecutionProvider']
+        else:
+            providers = ['CPUExecutionProvider']
+        self.session = ort.InferenceSession(model_path, providers=providers)
+        self.input_name = self.session.get_inputs()[0].name
+
+    def __call__(self, ims: Union[np.ndarray, torch.Tensor]):
+        ims = ims.numpy() if isinstance(ims, torch.Tensor) else ims
+        return self.session.run(None, {self.input_name: np.ascontiguousarray(ims, dtype=np.float32)})[0]
+
+
+class OpenVINOBackend:
+    """OpenVINO推理后端（需安装openvino，可直接读取ONNX或IR模型）"""
+    name = 'openvino'
+
+    def __init__(self, model_path: str, device: Optional[str] = None):
+        import openvino as ov
+        device = 'CPU' if device is None or str(device) == 'cpu' else str(device).upper()
+        # 支持bf16的CPU上默认会降低精度，导致识别结果与PyTorch不一致
+        self.model = ov.Core().compile_model(model_path, device, {'INFERENCE_PRECISION_HINT': 'f32'})
+        self.request = self.model.create_infer_request()
+
+    def __call__(self, ims: Union[np.ndarray, torch.Tensor]):
+        ims = ims.numpy() if isinstance(ims, torch.Tensor) else ims
+        self.request.infer([np.ascontiguousarray(ims, dtype=np.float32)])
+        return self.request.get_output_tensor(0).data.copy()
+
+
+BACKENDS = {
+    TorchBackend.name: TorchBackend,
+    ONNXBackend.name: ONNXBackend,
+    OpenVINOBackend.name: OpenVINOBackend,
+}
+
+def infer_backend(model_path: str):
+    """根据模型文件扩展名推断推理后端（.pth: torch, .onnx: onnxruntime, .xml: openvino）"""
+    ext = os.path.splitext(model_path)[1].lower()
+    return {'.onnx': ONNXBackend.name, '.xml': OpenVINOBackend.name}.get(ext, TorchBackend.name)
+
+
+def create_backend(model_path: str, device: Optional[Union[str, torch.device]] = None, backend: Optional[str] = None):
+    """创建推理后端（不指定backend时按模型文件扩展名推断）"""
+    backend = backend or infer_backend(model_path)
+    if backend not in BACKENDS:
+        raise ValueError(f"不支持的推理后端：{backend}（可选：{', '.join(BACKENDS)}）")
+    return BACKENDS[backend](model_path, device)
+
+
+def export_onnx(model: Union[str, torch.nn.Module], onnx_path: str, opset: int = 18):
+    """将LPRNet（权重路径或已加载的模型）导出为ONNX模型（批次维度可变）"""
+    model = load_lprnet(model) if isinstance(model, str) else model.cpu().eval()
+    dummy = torch.zeros((2, 3, 24, 94), dtype=torch.float32)
+    torch.onnx.export(
+        model,
+        (dummy, ),
+        onnx_path,
+        input_names=['input'],
+        output_names=['logits'],
+        dynamic_shapes=({0: torch.export.Dim('batch', min=1)}, ),
+        opset_version=opset,
+        dynamo=True # MaxPool3d作用于4维输入，旧的导出器会生成错误的MaxPool节点
+    )
+    return onnx_path
+
+
+def export_openvino(onnx_path: str, xml_path: str):
+    """将ONNX模型转换为OpenVINO IR（.xml/.bin）"""
+    import openvino as ov
+    ov.save_model(ov.convert_model(onnx_path), xml_path, compress_to_fp16=False) # 保持FP32权重
+    return xml_path
@@ -0,0 +1,95 @@
+import time
+import queue
+import threading
+import numpy as np
+from concurrent.futures import Future
+from typing import List
+
+from .recognizer import PlateRecognizer
+from .decoder import labels_to_plates
+
+
+class PlateBatcher:
+    """
+    跨帧/跨视频流的车牌批量识别器
+    将短时间窗口内各处提交的车牌裁剪图合并为一个(N,3,24,94)批次，只做一次前向推理，再按提交顺序拆分结果
+    与PlateRecognizer拥有相同的read/recognize接口，可直接替换使用
+    """
+    def __init__(self,
+        recognizer: PlateRecognizer,
+        max_batch: int = 32,
+        max_wait: float = 0.005
+    ):
+        self.recognizer = recognizer
+        self.max_batch = max_batch # 单批次最多车牌数
+        self.max_wait = max_wait # 凑批次的最长等待时间(s)
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def submit(self, crops: List[np.ndarray]):
+        """提交一组车牌裁剪图，返回Future（结果为字符idx数组列表与每个字符的置信度列表，顺序与crops一致）"""
+        future = Future()
+        if len(crops) == 0:
+            future.set_result(([], []))
+        else:
+            self._queue.put((list(crops), future))
+        return future
+
+    def read(self, crops: List[np.ndarray]):
+        """提交并等待识别结果"""
+        return self.submit(crops).result()
+
+    def recognize(self, crops: List[np.ndarray], return_confidence: bool = False):
+        """提交并等待识别结果（转换为车牌号）"""
+        labels, confidences = self.read(crops)
+        plates = labels_to_plates(labels)
+        return (plates, confidences) if return_confidence else plates
+
+    def close(self):
+        """停止批处理线程"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first):
+        """在等待窗口内收集更多请求"""
+        requests = [first]
+        size = len(first[0])
+        stop = False
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                stop = True
+                break
+            requests.append(item)
+            size += len(item[0])
+        return requests, stop
+
+    def _loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            requests, stop = self._collect(item)
+            crops = [crop for request_crops, _ in requests for crop in request_crops]
+            try:
+                labels, confidences = self.recognizer.read(crops)
+            except Exception as e:
+                for _, future in requests:
+                    future.set_exception(e)
+            else:
+                start = 0
+                for request_crops, future in requests:
+                    end = start + len(request_crops)
+                    future.set_result((labels[start:end], confidences[start:end]))
+                    start = end
+            if stop:
+                return
@@ -0,0 +1,80 @@
+import numpy as np
+import cv2
+
+
+class PlateTrackEntry:
+    """单个跟踪目标的车牌缓存项"""
+    __slots__ = ('plate', 'confidence', 'area', 'sharpness', 'read_frame', 'seen_frame')
+
+    def __init__(self, plate, confidence, area, sharpness, frame_id):
+        self.plate = plate # 最佳识别结果
+        self.confidence = confidence # 最佳识别结果的置信度
+        self.area = area # 上次识别时的裁剪图面积
+        self.sharpness = sharpness # 上次识别时的裁剪图清晰度
+        self.read_frame = frame_id # 上次识别的帧号
+        self.seen_frame = frame_id # 最后一次出现的帧号
+
+
+class PlateTrackCache:
+    """
+    按跟踪ID缓存车牌识别结果
+    同一目标只在裁剪图明显变大/变清晰，或超过指定帧数后才重新识别；目标消失后清除
+    """
+    def __init__(self,
+        refresh_frames: int = 50,
+        min_gain: float = 1.2,
+        max_missing: int = 5
+    ):
+        self.refresh_frames = refresh_frames # 强制重新识别的帧间隔
+        self.min_gain = min_gain # 面积/清晰度至少提升的倍数
+        self.max_missing = max_missing # 目标消失多少帧后清除
+
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def measure(crop: np.ndarray):
+        """计算裁剪图的面积与清晰度（拉普拉斯方差）"""
+        h, w = crop.shape[:2]
+        if h == 0 or w == 0:
+            return 0, 0.
+        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+        return h * w, float(cv2.Laplacian(gray, cv2.CV_32F).var())
+
+    def needs_read(self, track_id, area, sharpness, frame_id):
+        """判断目标是否需要重新识别"""
+        entry = self._entries.get(track_id)
+        if entry is None:
+            return True
+        entry.seen_frame = frame_id
+        if frame_id - entry.read_frame >= self.refresh_frames:
+            return True
+        return area > entry.area * self.min_gain or sharpness > entry.sharpness * self.min_gain # 严格大于：面积/清晰度为0时不会每帧重新识别
+
+    def update(self, track_id, plate, confidence, area, sharpness, frame_id):
+        """写入识别结果（只保留置信度最高的一次）"""
+        entry = self._entries.get(track_id)
+        if entry is None:
+            self._entries[track_id] = PlateTrackEntry(plate, confidence, area, sharpness, frame_id)
+            return
+        if confidence >= entry.confidence:
+            entry.plate = plate
+            entry.confidence = confidence
+        entry.area = area
+        entry.sharpness = sharpness
+        entry.read_frame = frame_id
+        entry.seen_frame = frame_id
+
+    def get(self, track_id):
+        """获取缓存的最佳识别结果"""
+        return self._entries.get(track_id)
+
+    def evict(self, frame_id):
+        """清除已消失的目标"""
+        for track_id in [track_id for track_id, entry in self._entries.items() if frame_id - entry.seen_frame > self.max_missing]:
+            del self._entries[track_id]
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,43 @@
+import numpy as np
+
+from .LPRNet import CHARS
+
+
+BLANK = len(CHARS) - 1 # 空白字符'-'的idx
+_CHARS = np.array(CHARS, dtype=object)
+
+
+def _softmax(prebs: np.ndarray, axis: int):
+    e = np.exp(prebs - prebs.max(axis=axis, keepdims=True))
+    return e / e.sum(axis=axis, keepdims=True)
+
+
+def greedy_decode(prebs: np.ndarray, return_confidence: bool = False):
+    """
+    CTC贪心解码（向量化）
+    对[N, 68, 18]的logits整体做一次argmax，再用数组运算去除重复字符和空白字符'-'
+    返回每张图片的字符idx数组列表，以及（可选的）每个字符的置信度数组列表
+    """
+    preb_label = prebs.argmax(axis=1)  # [N, 18]  每个位置最大的概率对应的字符idx
+    # 与前一个位置比较（首位之前视为空白），保留非空白且不重复的字符
+    pre_label = np.empty_like(preb_label)
+    pre_label[:, 0] = BLANK
+    pre_label[:, 1:] = preb_label[:, :-1]
+    keep = (preb_label != BLANK) & (preb_label != pre_label)
+    labels = [preb_label[i][keep[i]] for i in range(preb_label.shape[0])]
+    if not return_confidence:
+        return labels
+    probs = _softmax(prebs, axis=1).max(axis=1)  # [N, 18]  每个位置的最大概率
+    confidences = [probs[i][keep[i]] for i in range(probs.shape[0])]
+    return labels, confidences
+
+
+def labels_to_plates(labels):
+    """将字符idx数组转换为车牌号字符串"""
+    return [''.join(_CHARS[label]) for label in labels]
+
+
+def decode_plates(prebs: np.ndarray):
+    """解码整批logits，返回车牌号列表与每个字符的置信度列表"""
+    labels, confidences = greedy_decode(prebs, return_confidence=True)
+    return labels_to_plates(labels), confidences
@@ -1,53 +1,18 @@
 import numpy as np
 import cv2
-import torch
-import numpy as np
-
-from .LPRNet  import CHARS, build_lprnet
-
 
-def transform( img):
-    img = img.astype('float32')
-    img/=255
-    img = np.transpose(img, (2, 0, 1))
-    return img
+from .recognizer import get_recognizer
+from .decoder import labels_to_plates
 
 
 def de_lpr(coord,im0, lprnetModelPath: str):
-    img=im0[int(coord[1]):int(coord[3]), int(coord[0]):int(coord[2])]
-    ims = []
-
-    # cut = cv2.imread(img)
-    im = cv2.resize(img, (94, 24))
-    im = transform(im)
-    ims.append(im)
-    ims = torch.Tensor(np.array(ims))
-    lprnet = build_lprnet(lpr_max_len=8, phase=True, class_num=len(CHARS), dropout_rate=0.5)
-
-    device = torch.device("cuda:0" if torch.cuda.is_available() else "cpu")
-    lprnet.to(device)
-    lprnet.load_state_dict(torch.load(lprnetModelPath))
-    prebs = lprnet(ims.to(device))  # classifier prediction
-    prebs = prebs.cpu().detach().numpy()
-
-    preb_labels = list()
-    for i in range(prebs.shape[0]):
-        preb = prebs[i, :, :]  # 对每张图片 [68, 18]
-        preb_label = list()
-        for j in range(preb.shape[1]):  # 18  返回序列中每个位置最大的概率对应的字符idx  其中'-'是67
-            preb_label.append(np.argmax(preb[:, j], axis=0))
-        no_repeat_blank_label = list()
-        pre_c = preb_label[0]
-        if pre_c != len(CHARS) - 1:  # 记录重复字符
-            no_repeat_blank_label.append(pre_c)
-        for c in preb_label:  # 去除重复字符和空白字符'-'
-            if (pre_c == c) or (c == len(CHARS) - 1):
-                if c == len(CHARS) - 1:
-                    pre_c = c
-                continue
-            no_repeat_blank_label.append(c)
-            pre_c = c
-        preb_labels.append(no_repeat_blank_label)
+    # 使用常驻的识别器（模型只在首次调用时加载）
+    # 检测框为(4,)时返回(1,L)的数组；为(N,4)时各车牌长度可能不同，返回N个字符idx数组的列表
+    recognizer = get_recognizer(lprnetModelPath)
+    boxes = np.asarray(coord, dtype=np.float32)
+    preb_labels, _ = recognizer.read_boxes(im0, boxes[..., :4].reshape(-1, 4))  # classifier prediction
+    if boxes.ndim > 1:
+        return preb_labels
 
     plat_num = np.array(preb_labels)
     # print(plat_num)
@@ -57,11 +22,7 @@ def de_lpr(coord,im0, lprnetModelPath: str):
 def dr_plate(im0,coord,plat_num):
     x1=int(coord[0])
     x2=int(coord[1])
-    plate=np.array(plat_num)
-    a=""
-    for i in range(0,plate.shape[1]):
-        b=CHARS[plate[0][i]]
-        a+=b
+    a=labels_to_plates(plat_num)[0]
 
     cv2.putText(im0,a,(x1,x2),0,1,(255,0,0), thickness=2,
                             lineType=cv2.LINE_AA)
\ No newline at end of file
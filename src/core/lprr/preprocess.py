@@ -0,0 +1,66 @@
+import numpy as np
+import cv2
+import torch
+from typing import List, Tuple
+
+
+def clamp_boxes(xyxy: np.ndarray, shape: Tuple[int, ...]):
+    """
+    将检测框(N,4)裁剪到图像范围内（向量化）
+    返回int类型的检测框(N,4)与有效掩码（宽高均大于0）
+    """
+    h, w = shape[:2]
+    boxes = np.asarray(xyxy, dtype=np.float32).reshape(-1, 4).astype(np.int64) # 与int()相同，向零取整
+    np.clip(boxes[:, 0::2], 0, w, out=boxes[:, 0::2])
+    np.clip(boxes[:, 1::2], 0, h, out=boxes[:, 1::2])
+    valid = (boxes[:, 2] > boxes[:, 0]) & (boxes[:, 3] > boxes[:, 1])
+    return boxes, valid
+
+
+def crop_boxes(img: np.ndarray, boxes: np.ndarray):
+    """按clamp_boxes得到的检测框裁剪图像（返回视图，不复制像素）"""
+    return [img[y1:y2, x1:x2] for x1, y1, x2, y2 in boxes.tolist()]
+
+
+class PlatePreprocessor:
+    """
+    车牌预处理：将车牌裁剪图缩放后直接写入预分配的(N,3,24,94)批次缓冲区
+    缓冲区在各帧之间复用（批次变大时才扩容），使用CUDA推理时为锁页内存，可异步拷贝到显存
+    返回的张量是缓冲区的视图，下一次调用前有效
+    """
+    def __init__(self,
+        input_size: Tuple[int, int] = (94, 24),
+        capacity: int = 8,
+        pin_memory: bool = False
+    ):
+        self.input_size = input_size # 输入尺寸(w, h)
+        self.pin_memory = pin_memory and torch.cuda.is_available()
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        w, h = self.input_size
+        self.capacity = capacity
+        self.buffer = torch.empty((capacity, 3, h, w), dtype=torch.float32, pin_memory=self.pin_memory)
+        self._buffer = self.buffer.numpy() # 与buffer共享内存
+        self._resized = np.empty((capacity, h, w, 3), dtype=np.uint8) # 缩放后的HWC图像
+
+    def __call__(self, img: np.ndarray, xyxy: np.ndarray):
+        """从整帧图像按检测框(N,4)裁剪并预处理（超出图像范围的部分会被裁掉）"""
+        boxes, _ = clamp_boxes(xyxy, img.shape)
+        return self.from_crops(crop_boxes(img, boxes))
+
+    def from_crops(self, crops: List[np.ndarray]):
+        """预处理车牌裁剪图，返回(N,3,24,94)的张量（缓冲区视图）"""
+        n = len(crops)
+        if n > self.capacity:
+            self._allocate(max(n, self.capacity * 2))
+        w, h = self.input_size
+        resized = self._resized[:n]
+        for i, crop in enumerate(crops):
+            if crop.size == 0:
+                resized[i] = 0 # 空裁剪图（检测框在图像外）
+            else:
+                cv2.resize(crop, (w, h), dst=resized[i])
+        # HWC->CHW与归一化合并为一次写入
+        np.divide(resized.transpose(0, 3, 1, 2), 255, out=self._buffer[:n], dtype=np.float32)
+        return self.buffer[:n]
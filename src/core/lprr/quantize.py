@@ -0,0 +1,117 @@
+import os
+import copy
+import tempfile
+import numpy as np
+import torch.nn as nn
+from typing import Optional, Sequence
+from torch.nn.utils.fusion import fuse_conv_bn_eval
+
+from .LPRNet import small_basic_block
+from .backends import load_lprnet, export_onnx, ONNXBackend
+
+
+def fuse_conv_bn(model: nn.Module):
+    """
+    折叠backbone中相邻的Conv与BatchNorm（返回新模型）
+    BatchNorm替换为Identity，层的序号不变，forward中按序号保留的特征图不受影响
+    """
+    model = copy.deepcopy(model).eval()
+    layers = model.backbone
+    for i in range(1, len(layers)):
+        if not isinstance(layers[i], nn.BatchNorm2d):
+            continue
+        prev = layers[i - 1]
+        if isinstance(prev, small_basic_block): # 卷积块的最后一层
+            holder, index = prev.block, len(prev.block) - 1
+        elif isinstance(prev, nn.Conv2d):
+            holder, index = layers, i - 1
+        else:
+            continue
+        holder[index] = fuse_conv_bn_eval(holder[index], layers[i])
+        layers[i] = nn.Identity()
+    return model
+
+
+def prepare_fp32(model_path: str, onnx_path: str, opset: int = 18):
+    """折叠Conv与BatchNorm后导出FP32的ONNX模型，并做形状推断与图优化（量化前处理）"""
+    from onnxruntime.quantization import quant_pre_process
+    raw_path = f"{onnx_path}.raw"
+    export_onnx(fuse_conv_bn(load_lprnet(model_path)), raw_path, opset)
+    quant_pre_process(raw_path, onnx_path)
+    os.remove(raw_path)
+    return onnx_path
+
+
+def conv_nodes(onnx_path: str):
+    """模型中的卷积节点名称（按计算顺序）"""
+    import onnx
+    return [node.name for node in onnx.load(onnx_path).graph.node if node.op_type == 'Conv']
+
+
+def quantize_onnx(
+    fp32_path: str,
+    int8_path: str,
+    calibration: Sequence[np.ndarray],
+    nodes_to_quantize: Optional[Sequence[str]] = None,
+    nodes_to_exclude: Optional[Sequence[str]] = None
+):
+    """卷积层INT8静态量化（权重按通道对称量化，激活按百分位校准），归一化（Pow/ReduceMean/Div）保持FP32"""
+    from onnxruntime.quantization import quantize_static, CalibrationDataReader, CalibrationMethod, QuantFormat, QuantType
+
+    class Reader(CalibrationDataReader):
+        def __init__(self):
+            self.batches = iter(calibration)
+
+        def get_next(self):
+            batch = next(self.batches, None)
+            return None if batch is None else {'input': np.ascontiguousarray(batch, dtype=np.float32)}
+
+    quantize_static(
+        fp32_path,
+        int8_path,
+        Reader(),
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        op_types_to_quantize=['Conv'],
+        nodes_to_quantize=list(nodes_to_quantize) if nodes_to_quantize else None,
+        nodes_to_exclude=list(nodes_to_exclude) if nodes_to_exclude else None,
+        calibrate_method=CalibrationMethod.Percentile # 少数极端激活值不会拉大量化步长
+    )
+    return int8_path
+
+
+def conv_sensitivity(fp32_path: str, calibration: Sequence[np.ndarray], ims: np.ndarray):
+    """逐层敏感度：每次只量化一个卷积层，返回{节点名称: logits平均误差}"""
+    reference = ONNXBackend(fp32_path)(ims)
+    sensitivity = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        int8_path = os.path.join(tmp_dir, 'lprnet_layer.onnx')
+        for node in conv_nodes(fp32_path):
+            quantize_onnx(fp32_path, int8_path, calibration, nodes_to_quantize=[node])
+            sensitivity[node] = float(np.abs(ONNXBackend(int8_path)(ims) - reference).mean())
+    return sensitivity
+
+
+def quantize_lprnet(
+    model_path: str,
+    int8_path: str,
+    calibration: Sequence[np.ndarray],
+    keep_fp32: int = 2,
+    opset: int = 18
+):
+    """
+    生成INT8静态量化的LPRNet（ONNX，由ONNX Runtime推理）
+    calibration为预处理后的(N,3,24,94)批次；最敏感的keep_fp32个卷积层保持FP32，其余卷积层量化为INT8
+    返回保持FP32的卷积节点名称
+    """
+    calibration = list(calibration)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fp32_path = prepare_fp32(model_path, os.path.join(tmp_dir, 'lprnet_fused.onnx'), opset)
+        excluded = []
+        if keep_fp32 > 0:
+            sensitivity = conv_sensitivity(fp32_path, calibration, np.concatenate(calibration))
+            excluded = sorted(sensitivity, key=sensitivity.get, reverse=True)[:keep_fp32]
+        quantize_onnx(fp32_path, int8_path, calibration, nodes_to_exclude=excluded)
+    return excluded
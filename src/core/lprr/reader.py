@@ -0,0 +1,81 @@
+import numpy as np
+
+from .decoder import labels_to_plates
+from .cache import PlateTrackCache
+from .voting import PlateVoter
+from .preprocess import clamp_boxes, crop_boxes
+
+
+class PlateTrackReader:
+    """
+    按跟踪目标识别车牌
+    收集一帧中所有车牌检测框，按跟踪ID缓存跳过无需重复识别的车牌，其余一次批量识别，并投票产生最终事件
+    """
+    def __init__(self,
+        recognizer,
+        plate_class: int = 0,
+        conf_thres: float = 0.5,
+        cache: PlateTrackCache = None,
+        voter: PlateVoter = None
+    ):
+        self.recognizer = recognizer # PlateRecognizer或PlateBatcher
+        self.plate_class = plate_class # 车牌类别
+        self.conf_thres = conf_thres # 车牌字符最低置信度（低于该值的识别结果不显示）
+        self.cache = cache or PlateTrackCache() # 按跟踪ID缓存的车牌识别结果
+        self.voter = voter or PlateVoter() # 按跟踪ID投票产生最终车牌
+
+    def update(self, img: np.ndarray, xyxy: np.ndarray, class_id: np.ndarray, tracker_id: np.ndarray, frame_id: int):
+        """
+        处理一帧的检测结果
+        返回车牌检测框(M,4)、对应的跟踪ID列表、当前最佳车牌号列表（置信度不足时为空字符串）与本帧产生的PlateEvent列表
+        """
+        xyxy = np.atleast_2d(xyxy).reshape(-1, 4)
+        class_id = np.atleast_1d(class_id)
+        tracker_id = np.atleast_1d(tracker_id)
+        # 只处理车牌类别
+        mask = class_id[:len(xyxy)] == self.plate_class
+        plate_xyxy = xyxy[:len(mask)][mask]
+        plate_ids = tracker_id[:len(mask)][mask].astype(int).tolist()
+
+        read_ids = []
+        read_crops = []
+        read_stats = []
+        # 车牌获取（先收集当前帧中需要识别的车牌，裁剪图为原图的视图）
+        boxes, _ = clamp_boxes(plate_xyxy, img.shape)
+        for plate_id, crop in zip(plate_ids, crop_boxes(img, boxes)):
+            # 投票至少需要min_reads次识别，之后按缓存规则（裁剪图明显变大/变清晰或超过刷新间隔）重新识别
+            # 始终达不到阈值的目标最多识别max_reads次
+            area, sharpness = self.cache.measure(crop)
+            cache_due = self.cache.needs_read(plate_id, area, sharpness, frame_id)
+            attempts = self.voter.attempts(plate_id)
+            decided = self.voter.decided(plate_id)
+            if (attempts < self.voter.min_reads and not decided) or (cache_due and (decided or attempts < self.voter.max_reads)):
+                read_ids.append(plate_id)
+                read_crops.append(crop)
+                read_stats.append((area, sharpness))
+            else:
+                self.voter.touch(plate_id, frame_id)
+        # 需要识别的车牌一次批量识别
+        events = []
+        labels, confidences = self.recognizer.read(read_crops)
+        plates = labels_to_plates(labels)
+        for plate_id, label, plate, char_conf, (area, sharpness) in zip(read_ids, labels, plates, confidences, read_stats):
+            confidence = float(char_conf.min()) if len(char_conf) > 0 else 0.
+            self.cache.update(plate_id, plate, confidence, area, sharpness, frame_id)
+            # 投票，确定后每辆车只上报一次
+            event = self.voter.add(plate_id, label, char_conf, frame_id)
+            if event is not None:
+                events.append(event)
+        self.cache.evict(frame_id)
+        events += self.voter.evict(frame_id) # 消失时仍未确定的目标产生低置信度事件
+        # 当前帧各目标的最佳识别结果
+        # 识别次数已达上限的目标短暂遮挡后缓存项可能已被清除（缓存的消失帧数比投票短），此时没有结果
+        best_plates = []
+        for plate_id in plate_ids:
+            entry = self.cache.get(plate_id)
+            best_plates.append(entry.plate if entry is not None and entry.confidence >= self.conf_thres else "")
+        return plate_xyxy, plate_ids, best_plates, events
+
+    def clear(self):
+        self.cache.clear()
+        self.voter.clear()
@@ -0,0 +1,84 @@
+import threading
+import numpy as np
+import torch
+from typing import Optional, Union, List
+
+from .backends import TorchBackend, create_backend
+from .preprocess import PlatePreprocessor
+from .decoder import greedy_decode, labels_to_plates
+
+
+class PlateRecognizer:
+    """
+    常驻内存的LPRNet车牌识别器（模型只加载一次，之后每张车牌只做一次前向推理）
+    推理后端可选PyTorch、ONNX Runtime或OpenVINO（默认按模型文件扩展名选择）
+    """
+    input_size = (94, 24) # 输入尺寸(w, h)
+
+    def __init__(self,
+        model_path: str,
+        device: Optional[Union[str, torch.device]] = None,
+        warmup: bool = True,
+        backend: Optional[str] = None
+    ):
+        self.model_path = model_path
+
+        # 构建推理后端并加载模型
+        self.backend = create_backend(model_path, device, backend)
+
+        # 预处理批次缓冲区（各帧复用，CUDA推理时使用锁页内存）
+        pin_memory = isinstance(self.backend, TorchBackend) and self.backend.device.type == 'cuda'
+        self.preprocessor = PlatePreprocessor(self.input_size, pin_memory=pin_memory)
+        self._lock = threading.Lock() # 识别器在多个线程间共享，缓冲区同一时间只能被一次识别使用
+
+        # 预热（首次推理会触发内存分配与算子选择）
+        if warmup:
+            self.warmup()
+
+    def warmup(self, batch_size: int = 1):
+        """预热"""
+        w, h = self.input_size
+        self.forward(torch.zeros((batch_size, 3, h, w), dtype=torch.float32))
+
+    def preprocess(self, crops: List[np.ndarray]):
+        """将车牌裁剪图转换为(N,3,24,94)的张量（新分配，可长期保存）"""
+        with self._lock:
+            return self.preprocessor.from_crops(crops).clone()
+
+    def forward(self, ims: torch.Tensor):
+        """前向推理，返回[N, 68, 18]的logits"""
+        return self.backend(ims)
+
+    def read(self, crops: List[np.ndarray]):
+        """识别车牌裁剪图，返回每张图片的字符idx数组列表与每个字符的置信度列表"""
+        if len(crops) == 0:
+            return [], []
+        with self._lock:
+            prebs = self.forward(self.preprocessor.from_crops(crops))
+        return greedy_decode(prebs, return_confidence=True)
+
+    def read_boxes(self, img: np.ndarray, xyxy: np.ndarray):
+        """按检测框(N,4)直接从整帧图像识别车牌，返回值同read"""
+        if len(xyxy) == 0:
+            return [], []
+        with self._lock:
+            prebs = self.forward(self.preprocessor(img, xyxy))
+        return greedy_decode(prebs, return_confidence=True)
+
+    def recognize(self, crops: List[np.ndarray], return_confidence: bool = False):
+        """识别车牌裁剪图，返回车牌号字符串列表（以及每个字符的置信度）"""
+        labels, confidences = self.read(crops)
+        plates = labels_to_plates(labels)
+        return (plates, confidences) if return_confidence else plates
+
+
+_recognizers = {}
+_recognizers_lock = threading.Lock()
+
+def get_recognizer(model_path: str, device: Optional[Union[str, torch.device]] = None, backend: Optional[str] = None):
+    """获取进程内共享的识别器（按模型路径、设备与推理后端缓存）"""
+    key = (model_path, str(device), backend)
+    with _recognizers_lock:
+        if key not in _recognizers:
+            _recognizers[key] = PlateRecognizer(model_path, device, backend=backend)
+        return _recognizers[key]
@@ -0,0 +1,125 @@
+import numpy as np
+from collections import defaultdict
+
+from .decoder import labels_to_plates
+
+
+class PlateEvent:
+    """车牌最终识别事件（每个目标只产生一次）"""
+    __slots__ = ('track_id', 'plate', 'confidence', 'reads', 'frame_id', 'low_confidence')
+
+    def __init__(self, track_id, plate, confidence, reads, frame_id, low_confidence=False):
+        self.track_id = track_id # 跟踪ID
+        self.plate = plate # 车牌号
+        self.confidence = confidence # 投票置信度
+        self.reads = reads # 参与投票的识别次数
+        self.frame_id = frame_id # 产生事件的帧号
+        self.low_confidence = low_confidence # 未达到阈值、目标消失时按当前投票结果产生的事件
+
+    def __repr__(self):
+        flag = ", low_confidence" if self.low_confidence else ""
+        return f"PlateEvent(track_id={self.track_id}, plate={self.plate!r}, confidence={self.confidence:.2f}, reads={self.reads}{flag})"
+
+
+class PlateVote:
+    """单个跟踪目标的投票状态"""
+    __slots__ = ('attempts', 'reads', 'length_reads', 'positions', 'seen_frame', 'event')
+
+    def __init__(self, frame_id):
+        self.attempts = 0 # 识别尝试次数（包括没有识别出字符的结果）
+        self.reads = 0 # 总识别次数
+        self.length_reads = defaultdict(int) # 车牌长度 -> 识别次数
+        self.positions = {} # 车牌长度 -> 每个字符位置的{字符idx: 累计置信度}
+        self.seen_frame = frame_id # 最后一次出现的帧号
+        self.event = None # 已产生的最终事件
+
+
+class PlateVoter:
+    """
+    按跟踪ID进行流式车牌投票
+    每次识别结果按字符位置、以字符置信度为权重计票，投票置信度达到阈值后立即为该目标产生唯一的最终事件
+    始终达不到阈值的目标最多识别max_reads次，消失时按当前投票结果产生低置信度事件
+    """
+    def __init__(self,
+        conf_thres: float = 0.8,
+        min_reads: int = 2,
+        max_reads: int = 10,
+        max_missing: int = 30
+    ):
+        self.conf_thres = conf_thres # 投票置信度阈值
+        self.min_reads = min_reads # 产生事件前至少需要的识别次数
+        self.max_reads = max_reads # 未产生事件的目标最多识别的次数
+        self.max_missing = max_missing # 目标消失多少帧后清除
+
+        self._votes = {}
+
+    def decided(self, track_id):
+        """目标是否已经产生最终事件"""
+        vote = self._votes.get(track_id)
+        return vote is not None and vote.event is not None
+
+    def attempts(self, track_id):
+        """目标在产生事件前的识别尝试次数"""
+        vote = self._votes.get(track_id)
+        return 0 if vote is None else vote.attempts
+
+    def touch(self, track_id, frame_id):
+        """记录目标出现（未重新识别时调用）"""
+        vote = self._votes.get(track_id)
+        if vote is not None:
+            vote.seen_frame = frame_id
+
+    def add(self, track_id, label: np.ndarray, confidence: np.ndarray, frame_id):
+        """加入一次识别结果，若达到阈值则返回PlateEvent"""
+        vote = self._votes.get(track_id)
+        if vote is None:
+            vote = self._votes[track_id] = PlateVote(frame_id)
+        vote.seen_frame = frame_id
+        if vote.event is not None:
+            return None
+        vote.attempts += 1
+        if len(label) == 0:
+            return None
+        # 计票
+        length = len(label)
+        vote.reads += 1
+        vote.length_reads[length] += 1
+        positions = vote.positions.setdefault(length, [defaultdict(float) for _ in range(length)])
+        for votes, c, w in zip(positions, label.tolist(), confidence.tolist()):
+            votes[c] += w
+        # 判断是否达到阈值
+        if vote.reads < self.min_reads:
+            return None
+        consensus, score = self.consensus(vote)
+        if score < self.conf_thres:
+            return None
+        vote.event = PlateEvent(track_id, labels_to_plates([consensus])[0], score, vote.reads, frame_id)
+        return vote.event
+
+    @staticmethod
+    def consensus(vote: PlateVote):
+        """
+        计算当前投票结果
+        置信度 = 多数长度的占比 × 各位置获胜字符的平均置信度中的最小值
+        """
+        length = max(vote.length_reads, key=vote.length_reads.get)
+        length_reads = vote.length_reads[length]
+        consensus = np.empty(length, dtype=int)
+        score = 1.
+        for i, votes in enumerate(vote.positions[length]):
+            consensus[i] = max(votes, key=votes.get)
+            score = min(score, votes[consensus[i]] / length_reads)
+        return consensus, score * length_reads / vote.reads
+
+    def evict(self, frame_id):
+        """清除已消失的目标，返回其中未产生事件的目标按当前投票结果产生的低置信度PlateEvent列表"""
+        events = []
+        for track_id in [track_id for track_id, vote in self._votes.items() if frame_id - vote.seen_frame > self.max_missing]:
+            vote = self._votes.pop(track_id)
+            if vote.event is None and vote.reads > 0:
+                consensus, score = self.consensus(vote)
+                events.append(PlateEvent(track_id, labels_to_plates([consensus])[0], score, vote.reads, frame_id, low_confidence=True))
+        return events
+
+    def clear(self):
+        self._votes.clear()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+import threading
+from typing import Optional
+from concurrent.futures import Future
+from ultralytics import YOLO
+
+
+_detectors = {}
+_detectors_lock = threading.Lock()
+
+def get_detector(model_path: str, device: Optional[str] = None):
+    """
+    获取进程内常驻的检测模型（按模型路径与设备缓存），重复开启检测不会重新加载权重
+    同一实例的跟踪状态是共享的，同一时间只应有一路使用track(persist=True)
+    """
+    key = (model_path, str(device))
+    with _detectors_lock:
+        if key not in _detectors:
+            model = YOLO(model_path)
+            if device is not None:
+                model.to(device)
+            _detectors[key] = model
+        return _detectors[key]
+
+
+def preload_detector(model_path: str, device: Optional[str] = None):
+    """在后台线程中加载检测模型，返回Future（用于切换模型时不阻塞正在进行的检测）"""
+    future = Future()
+    def load():
+        try:
+            future.set_result(get_detector(model_path, device))
+        except Exception as e:
+            future.set_exception(e)
+    threading.Thread(target=load, name='detector-loader', daemon=True).start()
+    return future
+
+
+def release_detector(model_path: str, device: Optional[str] = None):
+    """释放常驻的检测模型"""
+    with _detectors_lock:
+        _detectors.pop((model_path, str(device)), None)
+
+
+def reset_tracking(model):
+    """
+    重置模型上的跟踪器状态（新一轮检测的跟踪ID从头开始）
+    只在原处重置，不删除predictor.trackers：删除后track()会重新注册跟踪回调，回调重复注册会导致每帧多次更新跟踪器
+    """
+    predictor = getattr(model, 'predictor', None)
+    trackers = getattr(predictor, 'trackers', None) if predictor is not None else None
+    if not trackers:
+        return
+    from ultralytics.trackers.basetrack import BaseTrack
+    for tracker in trackers:
+        tracker.reset()
+    BaseTrack.reset_id() # 跟踪ID计数器是全局的
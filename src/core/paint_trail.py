@@ -1,8 +1,8 @@
 # -*- coding: utf-8 -*-
 
+import threading
 import cv2
 import numpy as np
-from collections import deque
 
 
 palette = (2 ** 11 - 1, 2 ** 15 - 1, 2 ** 20 - 1)
@@ -19,8 +19,25 @@ COLORS_10 =[(144,238,144),(178, 34, 34),(221,160,221),(  0,255,  0),(  0,128,  0
             (218,165, 32),(255,250,240),(253,245,230),(244,164, 96),(210,105, 30)]
 
 
+#轨迹画布的网格背景（按分辨率缓存）
+_grid_backgrounds = {}
+def grid_background(height, width, grid_size=100, color=(255, 255, 255)):
+    """
+    网格背景（每种分辨率只绘制一次，返回只读数组，使用时复制到画布上）
+    """
+    key = (height, width, grid_size, color)
+    grid = _grid_backgrounds.get(key)
+    if grid is None:
+        grid = np.zeros((height, width, 3), dtype=np.uint8)
+        #线宽为1的横线与竖线即整行/整列像素
+        grid[::grid_size, :] = color
+        grid[:, ::grid_size] = color
+        grid.flags.writeable = False
+        _grid_backgrounds[key] = grid
+    return grid
+
+
 #颜色板
-dic_for_drawing_trails = {}
 def compute_color_for_labels(label):
     """
     设置不同类别的固定颜色
@@ -38,42 +55,102 @@ def compute_color_for_labels(label):
     return tuple(color)
 
 
-#绘制轨迹
-def draw_trail(img, bbox, names,object_id, identities=None, offset=(0, 0)):
-    try:
-        for key in list(dic_for_drawing_trails):
-            if key not in identities:
-                dic_for_drawing_trails.pop(key)
-    except:
-        pass
-
-    for i, box in enumerate(bbox):
-        x1, y1, x2, y2 = [int(i) for i in box]
-        x1 += offset[0]
-        x2 += offset[0]
-        y1 += offset[1]
-        y2 += offset[1]
-
-        #获取锚框boundingbox中心点
-        center = (int((x2+x1)/ 2), int((y2+y2)/2))
-
-        #获取目标ID
-        id = int(identities[i]) if identities is not None else 0
-        #创建新的缓冲区
-        if id not in dic_for_drawing_trails:
-          dic_for_drawing_trails[id] = deque(maxlen= 64)
-        try:
-            color = compute_color_for_labels(object_id[i])
-        except:
-            continue
-
-        dic_for_drawing_trails[id].appendleft(center)
-        #绘制轨迹
-        for i in range(1, len(dic_for_drawing_trails[id])):
-
-            if dic_for_drawing_trails[id][i - 1] is None or dic_for_drawing_trails[id][i] is None:
-                continue
-            #轨迹动态粗细
-            thickness = int(np.sqrt(64 / float(i + i)) * 1.5)
-            img = cv2.line(img, dic_for_drawing_trails[id][i - 1], dic_for_drawing_trails[id][i], color, thickness)
-    return img
\ No newline at end of file
+def _thickness_bands(maxlen):
+    """
+    按线宽把轨迹的线段分段：[(起点序号, 终点序号, 线宽)]，序号0为最新的点
+    第i段（连接第i-1与第i个点）的线宽为int(sqrt(maxlen / 2i) * 1.5)，越旧越细
+    """
+    bands = []
+    for i in range(1, maxlen):
+        thickness = int(np.sqrt(maxlen / float(i + i)) * 1.5)
+        if bands and bands[-1][2] == thickness:
+            bands[-1][1] = i
+        else:
+            bands.append([i - 1, i, thickness])
+    return [tuple(band) for band in bands if band[2] > 0]
+
+
+class _Trail:
+    """单个目标的轨迹点（定长环形缓冲区）"""
+    __slots__ = ('points', 'head', 'size', 'last_seen', 'color')
+
+    def __init__(self, maxlen, color):
+        self.points = np.empty((maxlen, 2), dtype=np.int32)
+        self.head = -1 # 最新的点的位置
+        self.size = 0
+        self.last_seen = 0
+        self.color = color
+
+    def append(self, point):
+        self.head = (self.head + 1) % len(self.points)
+        self.points[self.head] = point
+        self.size = min(self.size + 1, len(self.points))
+
+    def ordered(self):
+        """由新到旧排列的轨迹点"""
+        return self.points[(self.head - np.arange(self.size)) % len(self.points)]
+
+
+class TrailRenderer:
+    """
+    轨迹绘制（每个视频流一个实例，各实例互不影响，可在不同线程中同时绘制）
+    每个目标的轨迹点保存在定长环形缓冲区中；绘制时每个线宽区间只调用一次cv2.polylines
+    超过max_missing帧未出现的目标会被移除
+    """
+    def __init__(self, maxlen: int = 64, max_missing: int = 30):
+        self.maxlen = maxlen # 每条轨迹最多保留的点数
+        self.max_missing = max_missing # 目标消失多少帧后移除其轨迹
+        self.bands = _thickness_bands(maxlen)
+        self.trails = {} # 目标ID -> _Trail
+        self.frame_id = 0
+        self._lock = threading.Lock()
+
+    def update(self, bbox, identities, color_ids, frame_id=None, offset=(0, 0)):
+        """记录当前帧各目标的轨迹点（锚框底边中点），color_ids为决定轨迹颜色的编号（跟踪ID或类别）"""
+        with self._lock:
+            self.frame_id = self.frame_id + 1 if frame_id is None else frame_id
+            if len(bbox) > 0:
+                bbox = np.asarray(bbox)
+                points = np.stack([(bbox[:, 0] + bbox[:, 2]) / 2 + offset[0], bbox[:, 3] + offset[1]], axis=1).astype(np.int32)
+                for point, id, color_id in zip(points, identities, color_ids):
+                    trail = self.trails.get(int(id))
+                    if trail is None:
+                        trail = self.trails[int(id)] = _Trail(self.maxlen, compute_color_for_labels(int(color_id)))
+                    trail.append(point)
+                    trail.last_seen = self.frame_id
+            self._evict()
+
+    def _evict(self):
+        for id in [id for id, trail in self.trails.items() if self.frame_id - trail.last_seen > self.max_missing]:
+            del self.trails[id]
+
+    def evict(self, frame_id=None):
+        """没有检测结果的帧：只推进帧号并移除过期的轨迹"""
+        self.update((), (), (), frame_id)
+
+    def draw(self, img, identities=None):
+        """绘制轨迹（默认只绘制当前帧出现的目标）"""
+        with self._lock:
+            if identities is None:
+                trails = [trail for trail in self.trails.values() if trail.last_seen == self.frame_id]
+            else:
+                trails = [self.trails[int(id)] for id in identities if int(id) in self.trails]
+            for trail in trails:
+                if trail.size < 2:
+                    continue
+                points = trail.ordered()
+                for start, end, thickness in self.bands:
+                    if start >= trail.size - 1:
+                        break
+                    cv2.polylines(img, [points[start:min(end, trail.size - 1) + 1]], False, trail.color, thickness)
+        return img
+
+    def render(self, img, bbox, identities, color_ids, frame_id=None):
+        """记录并绘制当前帧的轨迹"""
+        self.update(bbox, identities, color_ids, frame_id)
+        return self.draw(img, identities)
+
+    def clear(self):
+        with self._lock:
+            self.trails.clear()
+            self.frame_id = 0
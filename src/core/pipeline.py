@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+import time
+from typing import Callable, Optional
+
+from .models import get_detector
+from .lprr import get_recognizer, PlateTrackReader, PlateEvent
+from .results import FrameResult
+
+
+class PlatePipeline:
+    """
+    无界面的检测-跟踪-车牌识别流水线
+    不依赖Qt，通过回调函数上报结果（可传入queue.Queue.put以使用队列）
+    """
+    def __init__(self,
+        model_path: str,
+        lprnet_model_path: str,
+        lprnet_device: Optional[str] = None,
+        iou_thres: float = 0.45,
+        conf_thres: float = 0.25,
+        on_plate: Optional[Callable[[PlateEvent], None]] = None,
+        on_frame: Optional[Callable[[FrameResult], None]] = None
+    ):
+        self.model_path = model_path
+        self.lprnet_model_path = lprnet_model_path
+        self.lprnet_device = lprnet_device
+        self.iou_thres = iou_thres # iou
+        self.conf_thres = conf_thres # conf
+
+        self.on_plate = on_plate # 每辆车投票确定车牌后回调一次
+        self.on_frame = on_frame # 每帧回调（FrameResult，不含图像）
+
+        self.plate_reader = PlateTrackReader(get_recognizer(lprnet_model_path, lprnet_device))
+        self.stopped = False
+        self.frame_count = 0
+        self.fps = 0.
+
+    def process(self, result, frame_id: int):
+        """处理一帧跟踪结果，返回{目标ID: 车牌号}"""
+        start = time.perf_counter()
+        frame = FrameResult(frame_id)
+        frame.timings.update(result.speed)  # 检测的预处理/推理/后处理耗时
+        if result.boxes.id is not None:
+            boxes = result.boxes
+            frame.xyxy = boxes.xyxy.cpu().numpy()
+            frame.class_id = boxes.cls.cpu().numpy().astype(int)
+            frame.tracker_id = boxes.id.cpu().numpy().astype(int)
+            _, plate_ids, plates, frame.events = self.plate_reader.update(
+                result.orig_img, frame.xyxy, frame.class_id, frame.tracker_id, frame_id
+            )
+            frame.plates = {plate_id: plate for plate_id, plate in zip(plate_ids, plates) if plate}
+            if self.on_plate is not None:
+                for event in frame.events:
+                    self.on_plate(event)
+        frame.class_num = len(set(frame.class_id.tolist()))
+        frame.timings['ocr'] = (time.perf_counter() - start) * 1000
+        if self.on_frame is not None:
+            self.on_frame(frame)
+        return frame.plates
+
+    def run(self, source):
+        """对输入源（视频文件、目录或摄像头索引）进行检测，直到结束或调用stop"""
+        self.stopped = False
+        self.frame_count = 0
+        self.plate_reader.clear()
+        model = get_detector(self.model_path)
+        start_time = time.time()
+        for result in model.track(source=source, stream=True, iou=self.iou_thres, conf=self.conf_thres, verbose=False):
+            if self.stopped:
+                break
+            self.process(result, self.frame_count)
+            self.frame_count += 1
+        self.fps = self.frame_count / max(time.time() - start_time, 1e-6)
+
+    def stop(self):
+        """停止检测（在下一帧生效）"""
+        self.stopped = True
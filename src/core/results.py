@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import numpy as np
+
+
+class FrameResult:
+    """
+    一帧的检测结果
+    只包含数组与少量标量；images只在有界面需要显示时才填充（已缩放的RGB图像），只关心车牌的使用方拿到的结果不含图像
+    """
+    __slots__ = ('frame_id', 'xyxy', 'class_id', 'tracker_id', 'plates', 'events', 'class_num', 'progress', 'fps', 'timings', 'images')
+
+    def __init__(self, frame_id, xyxy=None, class_id=None, tracker_id=None, plates=None, events=None):
+        self.frame_id = frame_id # 帧号
+        self.xyxy = np.empty((0, 4), dtype=np.float32) if xyxy is None else xyxy # 检测框(N,4)
+        self.class_id = np.empty(0, dtype=int) if class_id is None else class_id # 类别(N,)
+        self.tracker_id = np.empty(0, dtype=int) if tracker_id is None else tracker_id # 跟踪ID(N,)
+        self.plates = plates or {} # 当前帧的车牌识别结果{跟踪ID: 车牌号}
+        self.events = events or [] # 本帧（以及合并进来的被丢弃帧）投票确定的PlateEvent
+        self.class_num = 0 # 当前帧类别数
+        self.progress = 0 # 进度（0~1000，实时源为0）
+        self.fps = None # 帧率（只在重新计算的帧上有值）
+        self.timings = {} # 各阶段耗时(ms)
+        self.images = None # 图像名称('box'/'trail'/'target') -> 待显示的图像
+
+    def merge(self, older):
+        """合并一个未被取走就被覆盖的旧结果：保留其中的车牌事件，以及本帧没有的图像"""
+        self.events = older.events + self.events
+        if older.images:
+            self.images = {**older.images, **(self.images or {})}
+        if self.fps is None:
+            self.fps = older.fps
+
+    def __repr__(self):
+        return f"FrameResult(frame_id={self.frame_id}, boxes={len(self.xyxy)}, plates={self.plates}, events={len(self.events)})"
+
+
+class ResultSlot:
+    """
+    待取走的检测结果（只保留最新一帧）
+    使用方取走之前到达的新结果与旧结果合并（车牌事件不丢失），跨线程的通知最多只有一个在途，发送频率与使用方的处理速度一致
+    """
+    def __init__(self):
+        self.dropped = 0 # 未被取走就被合并的帧数
+        self._result = None
+        self._pending = False # 是否已通知且尚未取走
+        self._lock = threading.Lock()
+
+    def put(self, result: FrameResult):
+        """放入一帧结果，需要通知使用方时返回True"""
+        with self._lock:
+            if self._result is not None:
+                result.merge(self._result)
+                self.dropped += 1
+            self._result = result
+            notify = not self._pending
+            self._pending = True
+            return notify
+
+    def take(self):
+        """取走最新的结果（没有则返回None）"""
+        with self._lock:
+            result, self._result = self._result, None
+            self._pending = False
+            return result
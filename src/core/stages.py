@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+import threading
+from collections import deque
+from typing import Callable, Optional
+
+
+STOP = object() # 结束标记，沿流水线向下传递
+
+
+def is_live_source(source):
+    """是否为实时源（摄像头索引或网络流）"""
+    source = str(source)
+    return source.isdigit() or source.lower().startswith(('rtsp://', 'rtmp://', 'http://', 'https://'))
+
+
+class BoundedQueue:
+    """
+    有界队列
+    drop_oldest为True时（实时源）队列满则丢弃最旧的一项，保证延迟有界；否则（文件源）阻塞等待，向上游施加背压
+    等待均通过条件变量阻塞（不轮询），关闭队列会立即唤醒所有等待的线程
+    """
+    def __init__(self, maxsize: int = 2, drop_oldest: bool = False):
+        self.maxsize = maxsize
+        self.drop_oldest = drop_oldest
+        self.dropped = 0 # 丢弃的数量
+        self._items = deque()
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def put(self, item):
+        """放入一项，队列关闭后返回False"""
+        with self._cond:
+            if self.drop_oldest and item is not STOP:
+                if not self._closed and len(self._items) >= self.maxsize:
+                    self._items.popleft()
+                    self.dropped += 1
+            else:
+                self._cond.wait_for(lambda: self._closed or len(self._items) < self.maxsize)
+            if self._closed:
+                return False
+            self._items.append(item)
+            self._cond.notify_all()
+            return True
+
+    def get(self):
+        """取出一项，队列关闭后返回STOP"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._closed or self._items)
+            if self._closed:
+                return STOP
+            item = self._items.popleft()
+            self._cond.notify_all()
+            return item
+
+    def get_nowait(self):
+        """取出一项（没有则返回None）"""
+        with self._cond:
+            if self._closed or not self._items:
+                return None
+            item = self._items.popleft()
+            self._cond.notify_all()
+            return item
+
+    def empty(self):
+        with self._cond:
+            return not self._items
+
+    def close(self):
+        """关闭队列，唤醒所有等待的生产者与消费者"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class Stage:
+    """
+    流水线中的一个处理阶段（独立线程）
+    从输入队列取出一项，处理后放入输出队列；处理结果为None时不向下传递
+    """
+    def __init__(self,
+        name: str,
+        func: Callable,
+        input_queue: BoundedQueue,
+        output_queue: Optional[BoundedQueue] = None
+    ):
+        self.name = name
+        self.func = func
+        self.input_queue = input_queue
+        self.output_queue = output_queue
+        self.error = None # 处理过程中抛出的异常
+        self._thread = threading.Thread(target=self.run, name=name, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+    def run(self):
+        finished = False
+        try:
+            while True:
+                item = self.input_queue.get()
+                if item is STOP:
+                    finished = True
+                    break
+                result = self.func(item)
+                if result is not None and self.output_queue is not None:
+                    if not self.output_queue.put(result):
+                        break
+        except Exception as e:
+            self.error = e
+        finally:
+            # 异常或下游关闭时关闭输入队列，避免上游阻塞
+            if not finished:
+                self.input_queue.close()
+            if self.output_queue is not None:
+                self.output_queue.put(STOP)
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+import numpy as np
+import cv2
+import torch
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+from ultralytics.trackers.byte_tracker import BYTETracker
+from ultralytics.utils import IterableSimpleNamespace, yaml_load
+from ultralytics.utils.checks import check_yaml
+
+from .models import get_detector
+from .lprr import get_recognizer, PlateBatcher, PlateTrackReader
+from .paint_trail import TrailRenderer
+from .stages import BoundedQueue, is_live_source
+from .capture import FrameGrabber
+
+
+class StreamReader:
+    """
+    单个视频流的读取线程
+    实时源通过FrameGrabber只取最新的一帧（队列满时丢弃最旧的帧），文件源逐帧读取（队列满时阻塞）
+    """
+    def __init__(self, source, frame_ready: threading.Event, buffer_size: int = 2):
+        self.source = source
+        self.frame_ready = frame_ready # 有新帧时通知调度器
+        self.live = is_live_source(source)
+        self.frames = BoundedQueue(buffer_size, drop_oldest=self.live)
+        self.finished = False # 视频流是否结束
+
+        if self.live:
+            self.cap = None
+            self.grabber = FrameGrabber(source)
+            self.fps = 30
+        else:
+            self.cap = cv2.VideoCapture(source)
+            self.grabber = None
+            self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30
+        self._stopped = False
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def start(self):
+        if self.grabber is not None:
+            self.grabber.start()
+        self._thread.start()
+
+    def stop(self):
+        self._stopped = True
+        if self.grabber is not None:
+            self.grabber.stop()
+        self.frames.close()
+
+    def _loop(self):
+        while not self._stopped:
+            if self.grabber is not None:
+                frame = self.grabber.read(timeout=0.5)
+                if frame is None:
+                    continue
+            else:
+                ret, frame = self.cap.read()
+                if not ret:
+                    break
+            if not self.frames.put((frame, time.time())):
+                break
+            self.frame_ready.set()
+        if self.cap is not None:
+            self.cap.release()
+        self.finished = True
+        self.frame_ready.set()
+
+    def get(self):
+        """取一帧（没有则返回None）"""
+        return self.frames.get_nowait()
+
+    def health(self):
+        """实时源的健康状态（文件源返回None）"""
+        return self.grabber.health() if self.grabber is not None else None
+
+
+class StreamContext:
+    """
+    单个视频流的状态：读取器、跟踪器、车牌识别状态、轨迹缓冲区与统计信息
+    """
+    def __init__(self, name, source, lane, reader: StreamReader, tracker: BYTETracker, plate_reader: PlateTrackReader):
+        self.name = name
+        self.source = source
+        self.lane = lane # 车道类型（entry/exit）
+        self.reader = reader
+        self.tracker = tracker
+        self.plate_reader = plate_reader
+        self.trails = TrailRenderer() # 轨迹绘制（每路视频流独立）
+
+        self.frame_count = 0
+        self.fps = 0. # 处理帧率
+        self.latency = 0. # 读取到处理完成的延迟(s)
+        self._last_time = None
+
+    def update_stats(self, capture_time):
+        """更新帧率与延迟（指数滑动平均）"""
+        now = time.time()
+        latency = now - capture_time
+        self.latency = latency if self.frame_count == 0 else 0.9 * self.latency + 0.1 * latency
+        if self._last_time is not None:
+            fps = 1 / max(now - self._last_time, 1e-6)
+            self.fps = fps if self.fps == 0 else 0.9 * self.fps + 0.1 * fps
+        self._last_time = now
+        self.frame_count += 1
+
+    def stats(self):
+        return {
+            'frames': self.frame_count,
+            'fps': round(self.fps, 2),
+            'latency': round(self.latency, 4),
+            'health': self.reader.health(),
+        }
+
+
+class MultiStreamScheduler:
+    """
+    多路视频流调度器
+    每路视频流在各自线程中读取，各路的帧合并为一个批次送入共享的YOLO模型，车牌合并送入共享的LPRNet；
+    每路视频流保留各自的跟踪器与轨迹缓冲区
+    """
+    def __init__(self,
+        model_path: str,
+        lprnet_model_path: str,
+        lprnet_device: Optional[str] = None,
+        iou_thres: float = 0.45,
+        conf_thres: float = 0.25,
+        tracker_cfg: str = 'bytetrack.yaml',
+        draw_trails: bool = False,
+        on_plate: Optional[Callable] = None,
+        on_frame: Optional[Callable] = None
+    ):
+        self.iou_thres = iou_thres # iou
+        self.conf_thres = conf_thres # conf
+        self.tracker_cfg = IterableSimpleNamespace(**yaml_load(check_yaml(tracker_cfg)))
+        self.draw_trails = draw_trails # 是否绘制轨迹
+
+        self.on_plate = on_plate # 车牌事件回调（视频流, PlateEvent）
+        self.on_frame = on_frame # 每帧回调（视频流, 帧号, {目标ID: 车牌号}, 轨迹图像或None）
+
+        # 共享的模型（新增视频流不会重复加载权重）
+        self.model = get_detector(model_path)
+        self.plate_batcher = PlateBatcher(get_recognizer(lprnet_model_path, lprnet_device))
+
+        self.streams = {}
+        self.frame_ready = threading.Event()
+        self.executor = ThreadPoolExecutor(thread_name_prefix='stream')
+        self.stopped = False
+
+    def add_stream(self, name, source, lane=None):
+        """添加视频流"""
+        reader = StreamReader(source, self.frame_ready)
+        tracker = BYTETracker(args=self.tracker_cfg, frame_rate=int(reader.fps))
+        context = StreamContext(name, source, lane, reader, tracker, PlateTrackReader(self.plate_batcher))
+        self.streams[name] = context
+        reader.start()
+        return context
+
+    def remove_stream(self, name):
+        """移除视频流"""
+        context = self.streams.pop(name)
+        context.reader.stop()
+
+    def stats(self):
+        """各路视频流的帧率与延迟"""
+        return {name: context.stats() for name, context in self.streams.items()}
+
+    def _track(self, context: StreamContext, result):
+        """使用视频流各自的跟踪器进行跟踪"""
+        det = result.boxes.cpu().numpy()
+        if len(det) == 0:
+            return result
+        tracks = context.tracker.update(det, result.orig_img)
+        if len(tracks) == 0:
+            return result
+        idx = tracks[:, -1].astype(int)
+        result = result[idx]
+        result.update(boxes=torch.as_tensor(tracks[:, :-1]))
+        return result
+
+    def _process(self, context: StreamContext, result, capture_time):
+        """处理单路视频流的一帧"""
+        result = self._track(context, result)
+        frame_plates = {}
+        img_trail = None
+        if result.boxes.id is not None:
+            boxes = result.boxes
+            xyxy = boxes.xyxy.cpu().numpy()
+            tracker_id = boxes.id.cpu().numpy().astype(int)
+            _, plate_ids, plates, events = context.plate_reader.update(
+                result.orig_img, xyxy, boxes.cls.cpu().numpy().astype(int), tracker_id, context.frame_count
+            )
+            frame_plates = {plate_id: plate for plate_id, plate in zip(plate_ids, plates) if plate}
+            if self.on_plate is not None:
+                for event in events:
+                    self.on_plate(context, event)
+            if self.draw_trails:
+                img_trail = np.zeros_like(result.orig_img)
+                context.trails.render(img_trail, xyxy, tracker_id, boxes.cls.cpu().numpy().astype(int), context.frame_count)
+        elif self.draw_trails:
+            context.trails.evict(context.frame_count)
+        if self.on_frame is not None:
+            self.on_frame(context, context.frame_count, frame_plates, img_trail)
+        context.update_stats(capture_time)
+
+    def run(self):
+        """调度各路视频流，直到全部结束或调用stop"""
+        self.stopped = False
+        while not self.stopped and self.streams:
+            # 从各路视频流各取一帧组成批次
+            self.frame_ready.clear()
+            batch = []
+            for context in list(self.streams.values()):
+                item = context.reader.get()
+                if item is not None:
+                    batch.append((context, *item))
+                elif context.reader.finished and context.reader.frames.empty():
+                    self.streams.pop(context.name)
+            if not batch:
+                self.frame_ready.wait(timeout=0.1)
+                continue
+            # 共享模型批量检测
+            results = self.model.predict([frame for _, frame, _ in batch], iou=self.iou_thres, conf=self.conf_thres, verbose=False)
+            # 各路并行跟踪与识别（车牌在共享的LPRNet中合并为一个批次）
+            futures = [
+                self.executor.submit(self._process, context, result, capture_time)
+                for (context, _, capture_time), result in zip(batch, results)
+            ]
+            for future in futures:
+                future.result()
+
+    def stop(self):
+        """停止调度并关闭各路视频流"""
+        self.stopped = True
+        for context in self.streams.values():
+            context.reader.stop()
+
+    def close(self):
+        self.stop()
+        self.executor.shutdown()
+        self.plate_batcher.close()
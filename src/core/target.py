@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import cv2
+import numpy as np
+
+from .lprr import clamp_boxes
+
+
+class TargetView:
+    """
+    单目标跟踪的预览
+    每帧直接按锁定目标的检测框裁剪原图，缩放到固定大小的复用缓冲区中（不分配整帧掩码）
+    目标短暂丢失（遮挡）时沿用最后的位置，连续丢失超过max_missing帧才解除锁定
+    """
+    def __init__(self, size=(256, 256), max_missing=15):
+        self.size = size # 预览尺寸(宽, 高)
+        self.max_missing = max_missing # 允许连续丢失的帧数
+        self.track_id = None # 锁定的跟踪ID（None为未锁定）
+        self.last_xyxy = None # 最后一次出现时的检测框
+        self.missing = 0 # 连续丢失的帧数
+        self._preview = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        self._lock = threading.Lock() # 锁定由GUI线程修改，预览由工作线程生成
+
+    def lock(self, track_id):
+        """锁定跟踪ID（None为解除锁定）"""
+        with self._lock:
+            self.track_id = None if track_id is None else int(track_id)
+            self.last_xyxy = None
+            self.missing = 0
+
+    def unlock(self):
+        self.lock(None)
+
+    def update(self, img, xyxy, tracker_id):
+        """
+        更新锁定目标的位置并生成预览（BGR，复用的缓冲区，下一次调用前有效）
+        未锁定、目标尚未出现或已丢失时返回None
+        """
+        with self._lock:
+            if self.track_id is None:
+                return None
+            index = np.flatnonzero(np.asarray(tracker_id) == self.track_id) if tracker_id is not None and len(xyxy) else []
+            if len(index):
+                self.last_xyxy = np.asarray(xyxy[index[0]], dtype=np.float32)
+                self.missing = 0
+            else:
+                self.missing += 1
+                if self.missing > self.max_missing:
+                    self.track_id = None
+                    self.last_xyxy = None
+                    return None
+            if self.last_xyxy is None:
+                return None
+            (x1, y1, x2, y2), = clamp_boxes(self.last_xyxy, img.shape)[0]
+            if x2 <= x1 or y2 <= y1:
+                return None
+            return cv2.resize(img[y1:y2, x1:x2], self.size, dst=self._preview)
@@ -2,9 +2,9 @@
 
 import numpy as np
 import time
+import threading
 import cv2
 import supervision as sv
-from ultralytics import YOLO
 from ultralytics.engine.predictor import BasePredictor
 from ultralytics.utils import DEFAULT_CFG, SETTINGS
 from ultralytics.utils.torch_utils import smart_inference_mode
@@ -12,26 +12,29 @@ from ultralytics.cfg import get_cfg
 from ultralytics.utils.checks import check_imshow
 from PySide6.QtCore import Signal, QObject
 
-from .lprr import CHARS
-from .lprr.plate import de_lpr
-from .paint_trail import draw_trail
+from .lprr import get_recognizer, PlateTrackReader
+from .paint_trail import TrailRenderer, grid_background
+from .stages import STOP, BoundedQueue, Stage, is_live_source
+from .capture import FrameGrabber
+from .display import fit_image
+from .results import FrameResult, ResultSlot
+from .target import TargetView
+from .models import get_detector, preload_detector, reset_tracking
 
 
 class YoloPredictor(BasePredictor, QObject):
-    yolo2main_plate = Signal(str)  # 车牌信息
-    yolo2main_trail_img = Signal(np.ndarray)  # 轨迹图像信号
-    yolo2main_box_img = Signal(np.ndarray)  # 绘制了标签与锚框的图像的信号
+    yolo2main_plate = Signal(str)  # 车牌信息（每辆车投票确定后发送一次，只含车牌号）
+    yolo2main_result = Signal()  # 有新的检测结果（通过take_result()取出FrameResult，包含检测框、车牌、耗时、进度、帧率与待显示图像）
     yolo2main_status_msg = Signal(str)  # 检测/暂停/停止/测试完成等信号
-    yolo2main_fps = Signal(str)  # fps
     yolo2main_labels = Signal(dict)  # 检测到的目标结果（每个类别的数量）
-    yolo2main_progress = Signal(int)  # 进度条
-    yolo2main_class_num = Signal(int)  # 当前帧类别数
 
-    def __init__(self, lprnetModelPath, cfg=DEFAULT_CFG, overrides=None):
+    def __init__(self, lprnetModelPath, lprnetDevice=None, cfg=DEFAULT_CFG, overrides=None):
         super(YoloPredictor, self).__init__()
         QObject.__init__(self)
 
         self.lprnetModelPath = lprnetModelPath
+        self.lprnetDevice = lprnetDevice
+        self._plate_reader = None  # 车牌识别（首次使用时加载并常驻）
 
         try:
             self.args = get_cfg(cfg, overrides)
@@ -41,14 +44,20 @@ class YoloPredictor(BasePredictor, QObject):
             self.args.show = check_imshow(warn=True)
 
         # GUI args
-        self.used_model_name = None  # 使用过的检测模型名称
-        self.new_model_name = None  # 新更改的模型
+        self.new_model_name = None  # 检测模型路径
+        self.detector_device = None  # 检测模型的设备（None为自动选择）
+        self.model = None  # 当前使用的检测模型（常驻，来自get_detector）
+        self._pending_model = None  # 后台加载完成、等待推理阶段切换的模型
+        self.model_epoch = 0  # 检测模型切换次数（切换后跟踪ID从头开始，各阶段据此清除旧ID的状态）
+        self._ocr_epoch = 0  # 识别阶段已同步的model_epoch
+        self._render_epoch = 0  # 渲染阶段已同步的model_epoch
 
-        self.source = ''  # 输入源str
+        self.source = ''  # 输入源str（视频文件路径、摄像头索引或RTSP/HTTP地址）
         self.progress_value = 0  # 进度条的值
 
-        self.terminate_dtc = False  # 终止bool
-        self.suspend_dtc = False  # 暂停bool
+        self._terminate_event = threading.Event()  # 终止
+        self._resume_event = threading.Event()  # 未暂停时置位（暂停时读取阶段与实时源的抓帧器阻塞等待，不占用CPU）
+        self._resume_event.set()
 
         # config
         self.iou_thres = 0.45  # iou
@@ -62,186 +71,304 @@ class YoloPredictor(BasePredictor, QObject):
         self.count = 0
         self.class_num = 0
         self.total_frames = 0
-        self.lock_id = 0
+        self.frame_plates = {}  # 当前帧的车牌识别结果
+        self.names = {}  # 检测模型的类别名
+        self.queue_size = 2  # 各阶段之间的队列长度
+        self.stage_queues = []  # 各阶段之间的队列
+        self.live = False  # 是否为实时源（摄像头/网络流）
+        self.grabber = None  # 实时源的抓帧器
+        self.trail_renderer = TrailRenderer()  # 轨迹绘制
+        self.trail_buffer = None  # 轨迹画布（各帧复用，分辨率变化时重新分配）
+        self.target_view = TargetView()  # 单目标跟踪预览（默认不锁定）
+        self.display_sizes = {'target': self.target_view.size}  # 图像名称('box'/'trail'/'target') -> 显示区域大小(宽, 高)，未设置的图像不发送
+        self.result_slot = ResultSlot()  # 待取走的检测结果（只保留最新一帧）
 
         # 设置线条样式    厚度 & 缩放大小
         self.box_annotator = sv.BoxAnnotator(
             thickness=2,
         )
 
-    def emit_res(self, img_trail, img_box):
-        """信号发送"""
-        # 轨迹图像
-        self.yolo2main_trail_img.emit(img_trail)
+    @property
+    def lock_id(self):
+        """单目标跟踪锁定的ID（None为未锁定）"""
+        return self.target_view.track_id
+
+    @lock_id.setter
+    def lock_id(self, track_id):
+        self.target_view.lock(track_id)
+
+    @property
+    def plate_reader(self):
+        """车牌识别"""
+        if self._plate_reader is None:
+            self._plate_reader = PlateTrackReader(get_recognizer(self.lprnetModelPath, self.lprnetDevice))
+        return self._plate_reader
+
+    def set_display_size(self, name, width, height):
+        """设置图像的显示区域大小（由GUI在显示区域变化时调用）"""
+        self.display_sizes[name] = (width, height)
+
+    def take_result(self):
+        """取出最新的检测结果FrameResult（图像为RGB，已缩放到显示区域大小），没有则返回None"""
+        return self.result_slot.take()
+
+    def fit_display(self, frame, name, img):
+        """在工作线程中缩放并转换颜色，加入结果的待显示图像（未设置显示区域的图像不发送）"""
+        size = self.display_sizes.get(name)
+        if size is None:
+            return
+        if frame.images is None:
+            frame.images = {}
+        frame.images[name] = fit_image(img, size)
+
+    def emit_res(self, frame, img_box, render_start):
+        """结果发送（使用方还没取走上一帧时只合并结果、不重复通知）"""
         # 标签图
-        self.yolo2main_box_img.emit(img_box)
+        self.fit_display(frame, 'box', img_box)
         # 总类别数量
-        self.yolo2main_class_num.emit(self.class_num)
+        frame.class_num = self.class_num
         # 进度条
-        if '0' in self.source or 'rtsp' in self.source:
-            self.yolo2main_progress.emit(0)
-        else:
+        if not self.live and self.total_frames:
             self.progress_value = int(self.count / self.total_frames * 1000)
-            self.yolo2main_progress.emit(self.progress_value)
+            frame.progress = self.progress_value
         # FPS
         self.count += 1
         if self.count % 3 == 0 and self.count >= 3:  # 计算FPS
-            self.yolo2main_fps.emit(str(int(3 / (time.time() - self.start_time))))
+            frame.fps = int(3 / (time.time() - self.start_time))
             self.start_time = time.time()
+        frame.timings['render'] = (time.perf_counter() - render_start) * 1000
+        if self.result_slot.put(frame):
+            self.yolo2main_result.emit()
 
-    def single_object_tracking(self, detections, img_box):
-        """单目标跟踪"""
-        store_xyxy_for_id = {}
-        for xyxy, id in zip(detections.xyxy, detections.tracker_id):
-            store_xyxy_for_id[id] = xyxy
-            mask = np.zeros_like(img_box)
-        try:
-            if self.lock_id not in detections.tracker_id:
-                cv2.destroyAllWindows()
-                self.lock_id = None
-            x1, y1, x2, y2 = int(store_xyxy_for_id[self.lock_id][0]), int(store_xyxy_for_id[self.lock_id][1]), int(
-                store_xyxy_for_id[self.lock_id][2]), int(store_xyxy_for_id[self.lock_id][3])
-            cv2.rectangle(mask, (x1, y1), (x2, y2), (255, 255, 255), -1)
-            result_mask = cv2.bitwise_and(img_box, mask)
-            result_cropped = result_mask[y1:y2, x1:x2]
-            result_cropped = cv2.resize(result_cropped, (256, 256))
-            return result_cropped
-
-        except:
-            cv2.destroyAllWindows()
+    def single_object_tracking(self, frame, detections, img_res):
+        """单目标跟踪：直接裁剪锁定目标并以固定大小发送预览，目标丢失超过允许的帧数后解除锁定"""
+        if detections is None:
+            preview = self.target_view.update(img_res, np.empty((0, 4)), None)
+        else:
+            preview = self.target_view.update(img_res, detections.xyxy, detections.tracker_id)
+        if preview is not None:
+            self.fit_display(frame, 'target', preview)
+        elif self.target_view.track_id is None:
+            self.yolo2main_status_msg.emit('锁定目标已丢失')
 
-    def open_target_tracking(self, detections, img_res):
-        """单目标检测窗口开启"""
-        try:
-            # 单目标追踪
-            result_cropped = self.single_object_tracking(detections, img_res)
-            # print(result_cropped)
-            cv2.imshow(f'OBJECT-ID:{self.lock_id}', result_cropped)
-            cv2.moveWindow(f'OBJECT-ID:{self.lock_id}', 0, 0)
-            # press esc to quit
-            if cv2.waitKey(5) & 0xFF == 27:
-                self.lock_id = None
-                cv2.destroyAllWindows()
-        except:
-            cv2.destroyAllWindows()
+    def trail_canvas(self, height, width):
+        """轨迹画布：将缓存的网格背景复制到复用的缓冲区中（不重新分配、不重新画线）"""
+        grid = grid_background(height, width)
+        if self.trail_buffer is None or self.trail_buffer.shape != grid.shape:
+            self.trail_buffer = np.empty_like(grid)
+        np.copyto(self.trail_buffer, grid)
+        return self.trail_buffer
 
-    def res_address(self, img_res, result, height, width, model):
-        """进行识别——并返回所有结果"""
-        # 复制一份
-        img_box = np.copy(img_res)   # 右边的图（会绘制标签！） img_res是原图-不会受影响
-        img_trail = np.copy(img_res) # 左边的图
+    def res_address(self, img_res, frame, detections, plate_xyxy, label_plate):
+        """渲染识别结果——并发送给主窗口"""
+        frame_id = frame.frame_id
+        start = time.perf_counter()
+        height, width, _ = img_res.shape
+        img_trail = img_res  # 左边的图（不绘制轨迹时显示原图）
         # 如果没有识别的：
-        if result.boxes.id is None:
+        if detections is None:
             # 目标都是0
             self.class_num = 0
+            self.trail_renderer.evict(frame_id)
             print("暂未识别到目标！")
         # 如果有识别的
         else:
-            detections = sv.Detections.from_yolov8(result)
-            detections.tracker_id = result.boxes.id.cpu().numpy().astype(int)
             # id 、位置、目标总数
             self.class_num = self.get_class_number(detections)  # 类别数
             id = detections.tracker_id  # id
             xyxy = detections.xyxy  # 位置
-            # 轨迹绘制部分
-            if self.show_trace:
-                img_trail = np.zeros((height, width, 3), dtype='uint8')  # 黑布
-                identities = id
-                grid_color = (255, 255, 255)
-                line_width = 1
-                grid_size = 100
-                for y in range(0, height, grid_size):
-                    cv2.line(img_trail, (0, y), (width, y), grid_color, line_width)
-                for x in range(0, width, grid_size):
-                    cv2.line(img_trail, (x, 0), (x, height), grid_color, line_width)
-                draw_trail(img_trail, xyxy, model.model.names, id, identities)
+            # 轨迹绘制部分（按跟踪ID着色，只检测车牌时各目标的类别都相同）
+            # 没有显示轨迹图像时只记录轨迹点，不复制网格背景、不绘制
+            if self.show_trace and 'trail' in self.display_sizes:
+                img_trail = self.trail_canvas(height, width)
+                self.trail_renderer.render(img_trail, xyxy, id, id, frame_id)
             else:
-                img_trail = img_res  # 显示原图
-            # 画标签到图像上（并返回要写下的信息
-            labels_write, img_box = self.creat_labels(detections, img_box, model)
-            print("识别到目标\n%s" % labels_write)
-        # 抠锚框里的图  （单目标追踪）
+                self.trail_renderer.update(xyxy, id, id, frame_id)
+        # 抠锚框里的图  （单目标追踪，在绘制标签之前裁剪原图）
         if self.lock_id is not None:
-            self.lock_id = int(self.lock_id)
-            self.open_target_tracking(detections=detections, img_res=img_res)
-        # 传递信号给主窗口
-        self.emit_res(img_trail, img_box)
+            self.single_object_tracking(frame, detections, img_res)
+        # 轨迹图像（显示原图时需在绘制标签之前缩放）
+        self.fit_display(frame, 'trail', img_trail)
+        # 画标签到图像上（并返回要写下的信息）
+        # 渲染是最后一个阶段，原图之后不再使用，直接在原图上绘制而不复制
+        if detections is not None:
+            labels_write, img_res = self.creat_labels(detections, img_res, plate_xyxy, label_plate)
+            print("识别到目标\n%s" % labels_write)
+        # 传递结果给主窗口
+        self.emit_res(frame, img_res, start)
+
+    def capture_stage(self, cap, frame_queue):
+        """读取阶段：逐帧读取输入源"""
+        frame_id = 0
+        try:
+            while self.wait_resumed():
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if not frame_queue.put((frame_id, frame)):
+                    break
+                frame_id += 1
+        finally:
+            cap.release()
+            frame_queue.put(STOP)
+
+    def live_capture_stage(self, grabber, frame_queue):
+        """读取阶段（实时源）：只取最新的一帧，断线自动重连"""
+        frame_id = 0
+        connected = None
+        try:
+            while self.wait_resumed():
+                frame = grabber.read(timeout=0.5)
+                # 视频流状态变化
+                if grabber.connected != connected:
+                    connected = grabber.connected
+                    self.yolo2main_status_msg.emit('检测中...' if connected else '视频流已断开，正在重连...')
+                if frame is None:
+                    continue
+                if not frame_queue.put((frame_id, frame)):
+                    break
+                frame_id += 1
+        finally:
+            grabber.stop()
+            frame_queue.put(STOP)
+
+    def set_model(self, model_path):
+        """切换检测模型：在后台加载，加载完成后从下一帧起生效，检测不中断"""
+        self.new_model_name = model_path
+        future = preload_detector(model_path, self.detector_device)
+        future.add_done_callback(lambda future: self._swap_model(model_path, future))
+
+    def _swap_model(self, model_path, future):
+        if future.exception() is not None:
+            self.yolo2main_status_msg.emit(f'模型加载失败：{future.exception()!r}')
+            return
+        if model_path != self.new_model_name:  # 加载期间又切换了其他模型
+            return
+        # 在推理阶段的下一帧切换（不在加载线程中修改正在使用的跟踪状态）
+        self._pending_model = future.result()
+
+    def switch_model(self):
+        """推理阶段：切换到后台加载完成的模型，模型变化时重置跟踪并递增model_epoch"""
+        model, self._pending_model = self._pending_model, None
+        if model is not None and model is not self.model:
+            reset_tracking(model)
+            self.names = model.names
+            self.model = model
+            self.model_epoch += 1
+
+    def inference_stage(self, item):
+        """推理阶段：检测与跟踪"""
+        frame_id, frame = item
+        if self._pending_model is not None:
+            self.switch_model()
+        result = self.model.track(frame, persist=True, iou=self.iou_thres, conf=self.conf_thres, verbose=False)[0]
+        return frame_id, result, self.model_epoch
+
+    def ocr_stage(self, item):
+        """识别阶段：车牌识别"""
+        frame_id, result, epoch = item
+        # 模型切换后跟踪ID从头开始，清除旧ID的缓存与投票
+        if epoch != self._ocr_epoch:
+            self._ocr_epoch = epoch
+            self.plate_reader.clear()
+        start = time.perf_counter()
+        frame = FrameResult(frame_id)
+        frame.timings.update(result.speed)  # 检测的预处理/推理/后处理耗时
+        if result.boxes.id is None:
+            return result, frame, None, None, [], epoch
+        detections = sv.Detections.from_yolov8(result)
+        detections.tracker_id = result.boxes.id.cpu().numpy().astype(int)
+        frame.xyxy, frame.class_id, frame.tracker_id = detections.xyxy, detections.class_id, detections.tracker_id
+        plate_xyxy, label_plate, frame.events = self.read_plates(detections, result.orig_img, frame_id)
+        frame.plates = dict(self.frame_plates)
+        frame.timings['ocr'] = (time.perf_counter() - start) * 1000
+        return result, frame, detections, plate_xyxy, label_plate, epoch
+
+    def render_stage(self, item):
+        """渲染阶段：绘制并发送结果"""
+        result, frame, detections, plate_xyxy, label_plate, epoch = item
+        # 模型切换后跟踪ID从头开始，清除旧ID的轨迹与锁定
+        if epoch != self._render_epoch:
+            self._render_epoch = epoch
+            self.trail_renderer.clear()
+            self.target_view.unlock()
+        self.res_address(result.orig_img, frame, detections, plate_xyxy, label_plate)
 
     @smart_inference_mode()  # 一个修饰器，用来开启检测模式：如果torch>=1.9.0，则执行torch.inference_mode()，否则执行torch.no_grad()
     def run(self):
         """点击开始检测按钮后的检测事件"""
         self.count = 0                 # 拿来参与算FPS的计数变量
         self.start_time = time.time()  # 拿来算FPS的计数变量
-        # 加载模型
+        self._terminate_event.clear()
+        self.plate_reader.clear()
+        self.trail_renderer.clear()
+        # 获取常驻的检测模型（首次使用时加载），清除上一轮的跟踪状态
         self.yolo2main_status_msg.emit('正在加载模型...')
-        if self.used_model_name != self.new_model_name:
-            self.setup_model(self.new_model_name)
-            self.used_model_name = self.new_model_name
-        model = YOLO(self.new_model_name)
-        # 检测
-        if not ('mp4' in self.source or 'avi' in self.source or 'mkv' in self.source or 'flv' in self.source or 'mov' in self.source):
-            return
+        self.model = get_detector(self.new_model_name, self.detector_device)
+        reset_tracking(self.model)
+        self.names = self.model.names
+        self._pending_model = None
+        self._ocr_epoch = self._render_epoch = self.model_epoch
+        # 打开输入源
+        live = self.live = is_live_source(self.source)
+        if live:
+            # 摄像头/网络流：后台抓帧，只保留最新的一帧
+            self.grabber = FrameGrabber(self.source, resume_event=self._resume_event).start()  # 暂停时抓帧器也停止读取
+            self.total_frames = 0
+            capture_target, capture_args = self.live_capture_stage, (self.grabber, )
+        else:
+            # 视频文件：使用OpenCV读取视频（同时获取进度条）
+            cap = cv2.VideoCapture(self.source)
+            if not cap.isOpened():
+                self.yolo2main_status_msg.emit('无法打开输入源')
+                return
+            self.total_frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+            capture_target, capture_args = self.capture_stage, (cap, )
         self.yolo2main_status_msg.emit('检测中...')
-        # 使用OpenCV读取视频以获取进度条
-        cap = cv2.VideoCapture(self.source)
-        self.total_frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-        cap.release()
-        # 开始检测
-        iterModel = iter(
-            model.track(
-                source = self.source,
-                stream = True,
-                iou = self.iou_thres,
-                conf = self.conf_thres
-            )
-        )
-        while self.terminate_dtc == False:
-            if not self.suspend_dtc:
-                result = iterModel.__next__()
-                img_res = result.orig_img  # 原图
-                height, width, _ = img_res.shape
-                self.res_address(img_res, result, height, width, model)
+        # 各阶段之间通过有界队列连接（实时源丢弃最旧的帧，文件源向上游施加背压）
+        frame_queue = BoundedQueue(self.queue_size, drop_oldest=live)
+        result_queue = BoundedQueue(self.queue_size, drop_oldest=live)
+        render_queue = BoundedQueue(self.queue_size, drop_oldest=live)
+        self.stage_queues = [frame_queue, result_queue, render_queue]
+        stages = [
+            Stage('inference', self.inference_stage, frame_queue, result_queue),
+            Stage('ocr', self.ocr_stage, result_queue, render_queue),
+            Stage('render', self.render_stage, render_queue),
+        ]
+        capture_thread = threading.Thread(target=capture_target, args=(*capture_args, frame_queue), name='capture', daemon=True)
+        # 开始检测（渲染阶段在当前线程中运行）
+        capture_thread.start()
+        for stage in stages[:-1]:
+            stage.start()
+        stages[-1].run()
         # 结束检测
+        for queue in self.stage_queues:
+            queue.close()
+        capture_thread.join()
+        for stage in stages[:-1]:
+            stage.join()
+        for stage in stages:
+            if stage.error is not None:
+                self.yolo2main_status_msg.emit(f'检测出错：{stage.error!r}')
+        self.stage_queues = []
+        self.grabber = None
         self.source = None
         self.yolo2main_status_msg.emit('检测终止')
 
-    def creat_labels(self, detections, img_box, model):
+    def read_plates(self, detections, img, frame_id):
+        """车牌获取与识别（整帧批量识别，按跟踪ID缓存与投票）"""
+        plate_xyxy, plate_ids, label_plate, events = self.plate_reader.update(
+            img, detections.xyxy, detections.class_id, detections.tracker_id, frame_id
+        )
+        self.frame_plates = {plate_id: plate for plate_id, plate in zip(plate_ids, label_plate) if plate}  # 目标ID -> 车牌号
+        for event in events:
+            self.yolo2main_plate.emit(event.plate)
+        return plate_xyxy, label_plate, events
+
+    def creat_labels(self, detections, img_box, plate_xyxy, label_plate):
         """画标签到图像上"""
-        # 画车牌
-        label_plate = []
-        # 确保xyxy是二维数组 (n,4)
-        xy_xy_list = np.atleast_2d(detections.xyxy.squeeze())
-        class_id_list = detections.class_id.squeeze()
-        # 确保class_id_list是一维数组
-        if isinstance(class_id_list, np.ndarray):
-            class_id_list = class_id_list.tolist()
-        elif isinstance(class_id_list, (int, float)):
-            class_id_list = [class_id_list]
-        xyxy = []
-        # 车牌获取
-        for i in range(len(xy_xy_list)):
-            # 检查当前class_id
-            if isinstance(class_id_list, list) and i >= len(class_id_list):
-                continue
-            current_class = class_id_list[i] if isinstance(class_id_list, list) else class_id_list
-            if current_class != 0:  # 只处理车牌类别(假设0是车牌)
-                continue
-            xy_xy_filter = xy_xy_list[i]
-            xyxy.append(xy_xy_filter)
-            plate = de_lpr(xy_xy_filter, img_box, self.lprnetModelPath)
-            plate = np.array(plate)
-            car_number = ""
-            for m in range(0, plate.shape[1]):
-                # 将字符转换成车牌号码
-                b = CHARS[plate[0][m]]
-                car_number += b
-            label_plate.append(car_number)
-            self.yolo2main_plate.emit(car_number)
         # 修改坐标数组
-        if xyxy:  # 如果有车牌检测结果
-            detections.xyxy = np.array(xyxy)
-        else:
-            detections.xyxy = np.empty((0, 4))  # 返回空数组保持维度
+        detections.xyxy = plate_xyxy  # 没有车牌检测结果时为(0,4)的空数组
         # 要画出来的信息
         labels_draw = label_plate
         # 存储labels里的信息
@@ -265,6 +392,46 @@ class YoloPredictor(BasePredictor, QObject):
         #         class_num_arr.append(each)
         # return len(class_num_arr)
 
+    def stream_health(self):
+        """实时源的健康状态（非实时源返回None）"""
+        grabber = self.grabber
+        return grabber.health() if grabber is not None else None
+
+    @property
+    def terminate_dtc(self):
+        """终止bool"""
+        return self._terminate_event.is_set()
+
+    @property
+    def suspend_dtc(self):
+        """暂停bool"""
+        return not self._resume_event.is_set()
+
+    @suspend_dtc.setter
+    def suspend_dtc(self, value):
+        self.pause() if value else self.resume()
+
+    def pause(self):
+        """暂停"""
+        self._resume_event.clear()
+        self.yolo2main_status_msg.emit('检测暂停')
+
+    def resume(self):
+        """继续"""
+        self._resume_event.set()
+
+    def wait_resumed(self):
+        """暂停时阻塞直到继续或终止，返回是否继续检测"""
+        self._resume_event.wait()
+        return not self._terminate_event.is_set()
+
     def terminate(self):
         """终止"""
-        self.terminate_dtc = True
\ No newline at end of file
+        self._terminate_event.set()
+        self._resume_event.set()  # 唤醒暂停中的读取阶段
+        # 唤醒各阶段中阻塞的读写
+        grabber = self.grabber
+        if grabber is not None:
+            grabber.stop()
+        for queue in self.stage_queues:
+            queue.close()
\ No newline at end of file
@@ -0,0 +1,134 @@
+import os
+import sqlite3
+import threading
+import pandas as pd
+
+##############################################################################################################################
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S.%f' # 定长时间格式（字符串顺序即时间顺序）
+
+
+def to_text(time):
+    return pd.Timestamp(time).strftime(TIME_FORMAT)
+
+
+class SQLiteRecordStore:
+    """
+    基于SQLite的停车记录存储（WAL模式）
+    按车牌、入场时间与在场车辆建立索引，日期范围查询直接在SQL中完成，不需要把全部记录加载到内存
+    与ParkingState接口一致，可作为ParkingLot的后端
+    """
+    columns = ['License Plate', 'Entry Time', 'Exit Time', 'Fee']
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    plate TEXT NOT NULL,
+                    entry_time TEXT NOT NULL,
+                    exit_time TEXT,
+                    fee REAL NOT NULL DEFAULT 0
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_plate ON sessions(plate, entry_time)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_entry_time ON sessions(entry_time)")
+            self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_sessions_open ON sessions(plate) WHERE exit_time IS NULL")
+        # 在场车辆数（O(1)计数）
+        self._occupied = self._conn.execute("SELECT COUNT(*) FROM sessions WHERE exit_time IS NULL").fetchone()[0]
+
+    def _to_records(self, rows):
+        return [
+            {
+                'License Plate': plate,
+                'Entry Time': pd.Timestamp(entry_time),
+                'Exit Time': pd.Timestamp(exit_time) if exit_time is not None else pd.NaT,
+                'Fee': fee
+            }
+            for plate, entry_time, exit_time, fee in rows
+        ]
+
+    def _select(self, where="", params=()):
+        with self._lock:
+            rows = self._conn.execute(f"SELECT plate, entry_time, exit_time, fee FROM sessions {where}", params).fetchall()
+        return self._to_records(rows)
+
+    @property
+    def occupied(self):
+        """在场车辆数"""
+        return self._occupied
+
+    def is_parked(self, plate):
+        """车辆是否在场"""
+        return self.get_session(plate) is not None
+
+    def get_session(self, plate):
+        """获取车辆未结束的停车记录"""
+        records = self._select("WHERE plate = ? AND exit_time IS NULL", (plate, ))
+        return records[0] if records else None
+
+    def open_session(self, plate, entry_time):
+        """记录入场"""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO sessions (plate, entry_time) VALUES (?, ?)", (plate, to_text(entry_time)))
+        self._occupied += 1
+        return {'License Plate': plate, 'Entry Time': pd.Timestamp(entry_time), 'Exit Time': pd.NaT, 'Fee': 0.0}
+
+    def close_session(self, plate, exit_time, fee):
+        """记录出场"""
+        record = self.get_session(plate)
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE sessions SET exit_time = ?, fee = ? WHERE plate = ? AND exit_time IS NULL", (to_text(exit_time), fee, plate))
+        self._occupied -= 1
+        record['Exit Time'] = pd.Timestamp(exit_time)
+        record['Fee'] = fee
+        return record
+
+    def current_sessions(self):
+        """在场车辆的停车记录"""
+        return self._select("WHERE exit_time IS NULL ORDER BY entry_time")
+
+    def history(self):
+        """全部停车记录"""
+        return self._select("ORDER BY id")
+
+    def query(self, start_time, end_time, plate=None):
+        """查询入场时间在[start_time, end_time)内的记录"""
+        where = "WHERE entry_time >= ? AND entry_time < ?"
+        params = (to_text(start_time), to_text(end_time))
+        if plate:
+            where += " AND plate = ?"
+            params += (plate, )
+        return self.to_dataframe(self._select(where + " ORDER BY entry_time", params))
+
+    def to_dataframe(self, records=None):
+        """转换为DataFrame（不指定records时为全部历史记录）"""
+        return pd.DataFrame(self.history() if records is None else records, columns=self.columns)
+
+    def import_records(self, records):
+        """批量导入停车记录（用于从CSV迁移），返回导入的数量"""
+        rows = [
+            (
+                record['License Plate'],
+                to_text(record['Entry Time']),
+                to_text(record['Exit Time']) if not pd.isna(record['Exit Time']) else None,
+                0.0 if pd.isna(record['Fee']) else float(record['Fee'])
+            )
+            for record in records
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT INTO sessions (plate, entry_time, exit_time, fee) VALUES (?, ?, ?, ?)", rows)
+        self._occupied = self._conn.execute("SELECT COUNT(*) FROM sessions WHERE exit_time IS NULL").fetchone()[0]
+        return len(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+##############################################################################################################################
@@ -1,6 +1,8 @@
-from typing import Union, Optional
+import time
+from typing import Union, Optional, Callable
 from PySide6.QtCore import Qt, QObject, Signal, QThreadPool, QPoint
 from PySide6.QtWidgets import QWidget, QStackedWidget
+from PySide6.QtGui import QStandardItem
 from QEasyWidgets import QFunctions as QFunc, QWorker
 
 ##############################################################################################################################
@@ -55,4 +57,81 @@ class WorkerManager(QWorker.WorkerManager):
     def terminate(self):
         super().terminate()
 
-##############################################################################################################################
\ No newline at end of file
+##############################################################################################################################
+class VehiclesTableModel(QObject):
+    """
+    在场车辆表格的增量更新
+    监听ParkingLot的入场/出场事件：入场时追加一行，出场时删除对应行，没有变动时不做任何工作
+    事件经信号转发到GUI线程，因此也可以在工作线程中触发
+    """
+    changed = Signal(str, dict)
+
+    def __init__(self, table, parking_lot, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.table = table # TableBase（其内部为QStandardItemModel）
+        self.parking_lot = parking_lot
+        self._items = {} # 车牌 -> 该行的车牌单元格
+
+        for record in parking_lot.state.current_sessions():
+            self.insert(record)
+        self.changed.connect(self.apply)
+        parking_lot.add_listener(self._on_change)
+
+    def _on_change(self, event, record):
+        self.changed.emit(event, record)
+
+    def insert(self, record):
+        plate = record['License Plate']
+        if plate in self._items:
+            return
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        item = QStandardItem(plate)
+        self.table.setItem(row, 0, item)
+        self.table.setItem(row, 1, QStandardItem(str(record['Entry Time'])))
+        self._items[plate] = item
+
+    def remove(self, record):
+        item = self._items.pop(record['License Plate'], None)
+        if item is not None:
+            self.table.removeRow(item.row())
+
+    def apply(self, event, record):
+        self.insert(record) if event == 'entry' else self.remove(record)
+
+    def close(self):
+        self.parking_lot.remove_listener(self._on_change)
+
+##############################################################################################################################
+
+class StartupLoader(QObject):
+    """
+    后台加载器：在线程池中依次执行耗时的加载步骤（导入深度学习库、加载模型等），窗口无需等待即可显示
+    每完成一步发送进度，全部完成后发送loaded，出错时发送failed
+    """
+    progress = Signal(int, str)  # 进度(0~100)、当前步骤
+    loaded = Signal(dict)  # {步骤名称: 返回值}（各步骤耗时见timings）
+    failed = Signal(str)
+
+    def __init__(self, steps: list[tuple[str, str, Callable]], parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.steps = steps # [(步骤名称, 提示文本, 函数)]，函数的参数为已完成步骤的返回值
+        self.results = {}
+        self.timings = {}
+
+    def run(self):
+        try:
+            for index, (name, text, func) in enumerate(self.steps):
+                self.progress.emit(int(index / len(self.steps) * 100), text)
+                start_time = time.perf_counter()
+                self.results[name] = func(self.results)
+                self.timings[name] = time.perf_counter() - start_time
+            self.progress.emit(100, "加载完成")
+            self.loaded.emit(self.results)
+        except Exception as e:
+            self.failed.emit(repr(e))
+
+    def start(self, threadPool: QThreadPool):
+        threadPool.start(self.run)
+
+##############################################################################################################################
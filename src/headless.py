@@ -0,0 +1,135 @@
+import sys
+import json
+import time
+import argparse
+import threading
+from pathlib import Path
+from datetime import datetime
+
+from core import PlatePipeline, MultiStreamScheduler
+from utils import ParkingLot
+from config import Config
+
+##############################################################################################################################
+
+# 启动参数解析
+parser = argparse.ArgumentParser(description = "无界面车牌识别")
+parser.add_argument("--configPath", help = "配置路径", type = str, default = Path(__file__).parent.parent.joinpath('config.json').as_posix())
+parser.add_argument("--source", help = "输入源（视频文件、目录或摄像头索引），可指定多个", type = str, nargs = '+', required = True)
+parser.add_argument("--lane", help = "车道类型（entry: 入口, exit: 出口；不指定则只输出车牌事件），可按输入源分别指定", type = str, nargs = '+', choices = ['entry', 'exit'], default = None)
+parser.add_argument("--statsInterval", help = "多路输入时输出帧率/延迟统计的间隔(s)", type = float, default = 10)
+parser.add_argument("--output", help = "输出文件（默认输出到stdout）", type = str, default = '-')
+parser.add_argument("--device", help = "LPRNet推理设备（如cpu、cuda:0）", type = str, default = None)
+parser.add_argument("--acceptLowConfidence", help = "低置信度事件（目标消失时仍未达到投票阈值）也进行出入场处理（默认只输出车牌事件）", action = "store_true")
+
+##############################################################################################################################
+
+def main(args):
+    configPath = args.configPath
+    config = Config(configPath)
+
+    # 从配置中获取模型路径
+    model_paths = config.get_model_paths()
+    detect_model_path = Path(configPath).parent.joinpath(model_paths['yolo_model']).as_posix()
+    lprnet_model_path = Path(configPath).parent.joinpath(model_paths['lprnet_model']).as_posix()
+
+    # 各输入源的车道类型
+    lanes = args.lane or [None]
+    if len(lanes) == 1:
+        lanes = lanes * len(args.source)
+    if len(lanes) != len(args.source):
+        parser.error("--lane 的数量需为1或与 --source 一致")
+
+    # 停车场（指定车道类型时处理出入场）
+    parking_lot = ParkingLot(configPath) if any(lanes) else None
+    parking_lock = threading.Lock()
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'a', encoding = 'utf-8')
+    output_lock = threading.Lock() # 多路输入时各路在不同线程中回调
+
+    def write(record, source):
+        """以JSON Lines格式输出"""
+        record['time'] = datetime.now().isoformat(timespec = 'milliseconds')
+        record['source'] = source
+        with output_lock:
+            output.write(json.dumps(record, ensure_ascii = False) + '\n')
+            output.flush()
+
+    def on_plate(event, source, lane):
+        """车牌事件"""
+        write({
+            'type': 'plate',
+            'track_id': event.track_id,
+            'plate': event.plate,
+            'confidence': round(event.confidence, 4),
+            'reads': event.reads,
+            'frame': event.frame_id,
+            'low_confidence': event.low_confidence,
+        }, source)
+        if lane is None:
+            return
+        # 未达到投票阈值的车牌不进入出入场处理
+        if event.low_confidence and not args.acceptLowConfidence:
+            return
+        # 停车交易
+        with parking_lock:
+            if lane == 'entry':
+                success, message = parking_lot.process_entry(event.plate)
+            else:
+                success, message = parking_lot.process_exit(event.plate)
+        write({
+            'type': lane,
+            'plate': event.plate,
+            'success': success,
+            'message': message,
+        }, source)
+
+    lprnet_device = args.device or model_paths.get('lprnet_device')
+    sources = [int(source) if source.isdigit() else source for source in args.source]
+    try:
+        # 单路输入
+        if len(sources) == 1:
+            pipeline = PlatePipeline(
+                detect_model_path,
+                lprnet_model_path,
+                lprnet_device = lprnet_device,
+                on_plate = lambda event: on_plate(event, args.source[0], lanes[0])
+            )
+            try:
+                pipeline.run(sources[0])
+            except KeyboardInterrupt:
+                pipeline.stop()
+            return
+        # 多路输入（共享模型）
+        last_stats = [time.time()]
+        def on_frame(context, frame_id, frame_plates, img_trail):
+            if time.time() - last_stats[0] >= args.statsInterval:
+                last_stats[0] = time.time()
+                write({'type': 'stats', 'streams': scheduler.stats()}, None)
+        scheduler = MultiStreamScheduler(
+            detect_model_path,
+            lprnet_model_path,
+            lprnet_device = lprnet_device,
+            on_plate = lambda context, event: on_plate(event, context.name, context.lane),
+            on_frame = on_frame
+        )
+        for name, source, lane in zip(args.source, sources, lanes):
+            scheduler.add_stream(name, source, lane)
+        try:
+            scheduler.run()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            scheduler.close()
+    finally:
+        if parking_lot is not None:
+            parking_lot.close()
+        if output is not sys.stdout:
+            output.close()
+
+##############################################################################################################################
+
+if __name__ == '__main__':
+    main(parser.parse_args())
+
+##############################################################################################################################
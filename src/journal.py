@@ -0,0 +1,101 @@
+import os
+import json
+import time
+import threading
+
+##############################################################################################################################
+
+class Journal:
+    """
+    追加写入的事务日志（JSON Lines）
+    每条记录写入后立即flush到操作系统；fsync按批次进行（达到batch_size条时立即进行，否则由定时器在sync_interval秒内进行）
+    车流稀疏时最后一条记录也不会长时间停留在操作系统缓存中（断电时丢失）
+    """
+    def __init__(self, path, batch_size = 16, sync_interval = 1.0):
+        self.path = path
+        self.batch_size = batch_size # 每多少条记录fsync一次
+        self.sync_interval = sync_interval # 最长多少秒fsync一次
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.count = sum(1 for _ in self.replay()) # 日志中的记录数
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._timer = None # 待执行的定时fsync
+        self._lock = threading.RLock() # 定时器线程与写入线程互斥
+        # 崩溃时最后一行可能没写完，补上换行避免与新记录连在一起
+        if self._file.tell() > 0:
+            with open(self.path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self._file.write('\n')
+                    self._file.flush()
+
+    def append(self, record):
+        """追加一条记录"""
+        with self._lock:
+            self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self._file.flush()
+            self._pending += 1
+            self.count += 1
+            if self._pending >= self.batch_size or time.monotonic() - self._last_sync >= self.sync_interval:
+                self.sync()
+            elif self._timer is None:
+                # 最迟sync_interval秒后落盘
+                self._timer = threading.Timer(self.sync_interval, self._timed_sync)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _timed_sync(self):
+        with self._lock:
+            self._timer = None
+            if self._pending > 0 and not self._file.closed:
+                self.sync()
+
+    def sync(self):
+        """将已写入的记录落盘"""
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending = 0
+            self._last_sync = time.monotonic()
+
+    def replay(self):
+        """按顺序读取日志中的记录（忽略崩溃时写了一半的行）"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def truncate(self):
+        """清空日志（快照写入完成后调用）"""
+        with self._lock:
+            self._file.close()
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self.sync()
+            self.count = 0
+
+    def close(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._file.closed:
+                self.sync()
+                self._file.close()
+
+
+def write_atomic(path, write):
+    """先写入临时文件并落盘，再原子替换目标文件，避免写到一半时崩溃损坏原文件"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+##############################################################################################################################
@@ -0,0 +1,257 @@
+import os
+import time
+import argparse
+import numpy as np
+import cv2
+from pathlib import Path
+
+from config import Config
+from core.lprr import PlateRecognizer, PlateTrackReader, PlateVoter, export_onnx, export_openvino, quantize_lprnet, greedy_decode, labels_to_plates
+
+##############################################################################################################################
+
+# 启动参数解析
+parser = argparse.ArgumentParser(description = "LPRNet模型工具：导出ONNX/OpenVINO模型，比较各推理后端的一致性与延迟")
+parser.add_argument("--configPath", help = "配置路径", type = str, default = Path(__file__).parent.parent.joinpath('config.json').as_posix())
+subparsers = parser.add_subparsers(dest = "command", required = True)
+
+export_parser = subparsers.add_parser("export", help = "导出ONNX模型（批次维度可变），可同时转换为OpenVINO IR")
+export_parser.add_argument("--weights", help = "PyTorch权重（默认使用配置中的models.lprnet_model）", type = str, default = None)
+export_parser.add_argument("--output", help = "ONNX模型路径（默认与权重同名）", type = str, default = None)
+export_parser.add_argument("--opset", help = "ONNX opset版本", type = int, default = 18)
+export_parser.add_argument("--openvino", help = "同时转换为OpenVINO IR（.xml/.bin）", action = "store_true")
+
+benchmark_parser = subparsers.add_parser("benchmark", help = "在车牌裁剪图上比较各推理后端与PyTorch的一致性和延迟")
+benchmark_parser.add_argument("--weights", help = "PyTorch权重（默认使用配置中的models.lprnet_model）", type = str, default = None)
+benchmark_parser.add_argument("--models", help = "参与比较的模型文件（.onnx/.xml），后端按扩展名选择", type = str, nargs = '*', default = [])
+benchmark_parser.add_argument("--backends", help = "对应--models指定推理后端（可选）", type = str, nargs = '*', default = None)
+benchmark_parser.add_argument("--crops", help = "车牌裁剪图目录（不指定则使用随机图像，只比较一致性）", type = str, default = None)
+benchmark_parser.add_argument("--batchSizes", help = "测量延迟的批次大小", type = int, nargs = '+', default = [1, 8, 32])
+benchmark_parser.add_argument("--repeat", help = "每个批次大小的重复次数", type = int, default = 20)
+benchmark_parser.add_argument("--device", help = "推理设备", type = str, default = None)
+
+quantize_parser = subparsers.add_parser("quantize", help = "折叠Conv与BatchNorm并进行INT8静态量化（ONNX Runtime），报告与FP32的精度差异")
+quantize_parser.add_argument("--weights", help = "PyTorch权重（默认使用配置中的models.lprnet_model）", type = str, default = None)
+quantize_parser.add_argument("--crops", help = "车牌裁剪图目录（用于校准与评估）", type = str, required = True)
+quantize_parser.add_argument("--output", help = "量化模型路径（默认使用配置中的models.lprnet_int8_model）", type = str, default = None)
+quantize_parser.add_argument("--calibrationCount", help = "用于校准的图像数量（其余图像用于评估，图像不足时全部用于评估）", type = int, default = 256)
+quantize_parser.add_argument("--keepFp32", help = "保持FP32的最敏感卷积层数量", type = int, default = 2)
+quantize_parser.add_argument("--labelsFromNames", help = "文件名（第一个'_'之前）为车牌号真值，同时报告识别准确率", action = "store_true")
+quantize_parser.add_argument("--enable", help = "完成后在配置中启用INT8模式（models.lprnet_precision）", action = "store_true")
+
+check_parser = subparsers.add_parser("check-batch", help = "回归检查：同一车牌单独识别与在不同批次中识别的结果应一致")
+check_parser.add_argument("--weights", help = "模型文件（默认使用配置中的models.lprnet_model）", type = str, default = None)
+check_parser.add_argument("--crops", help = "车牌裁剪图目录（不指定则使用随机图像）", type = str, default = None)
+check_parser.add_argument("--batchSizes", help = "检查的批次大小", type = int, nargs = '+', default = [2, 7, 32])
+check_parser.add_argument("--tolerance", help = "logits允许的最大误差", type = float, default = 1e-3)
+check_parser.add_argument("--device", help = "推理设备", type = str, default = None)
+
+reader_parser = subparsers.add_parser("check-reader", help = "回归检查：按跟踪ID缓存与投票的识别次数上限、遮挡后重新出现与消失时的低置信度事件（不需要模型）")
+reader_parser.add_argument("--frames", help = "目标静止的帧数", type = int, default = 250)
+reader_parser.add_argument("--confidence", help = "模拟的字符置信度（低于投票阈值）", type = float, default = 0.5)
+reader_parser.add_argument("--maxReads", help = "未确定目标的识别次数上限（静止期间应达到上限）", type = int, default = 3)
+
+##############################################################################################################################
+
+def default_weights(configPath):
+    """配置中的LPRNet权重路径（FP32）"""
+    return Path(configPath).parent.joinpath(Config(configPath).get('models', 'lprnet_model')).as_posix()
+
+
+def load_crops(folder = None, count = 64, return_names = False):
+    """读取车牌裁剪图（不指定目录时生成随机图像）"""
+    if folder is None:
+        rng = np.random.default_rng(0)
+        crops = [rng.integers(0, 256, (24, 94, 3), dtype = np.uint8) for _ in range(count)]
+        return (crops, [None] * count) if return_names else crops
+    crops, names = [], []
+    for name in sorted(os.listdir(folder)):
+        if os.path.splitext(name)[1].lower() in ('.jpg', '.jpeg', '.png', '.bmp'):
+            crop = cv2.imdecode(np.fromfile(os.path.join(folder, name), dtype = np.uint8), cv2.IMREAD_COLOR) # 支持中文文件名
+            if crop is not None:
+                crops.append(crop)
+                names.append(name)
+    if not crops:
+        raise SystemExit(f"目录 {folder} 中没有图像")
+    return (crops, names) if return_names else crops
+
+
+def recognize_all(recognizer, crops, batch_size = 32):
+    """分批识别，返回车牌号列表"""
+    plates = []
+    for i in range(0, len(crops), batch_size):
+        plates += labels_to_plates(greedy_decode(recognizer.forward(recognizer.preprocess(crops[i:i + batch_size]))))
+    return plates
+
+
+def measure_latency(recognizer, crops, batch_sizes, repeat):
+    """测量各批次大小的单批推理延迟(ms)"""
+    latencies = {}
+    for batch_size in batch_sizes:
+        ims = recognizer.preprocess([crops[i % len(crops)] for i in range(batch_size)])
+        recognizer.forward(ims)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            recognizer.forward(ims)
+        latencies[batch_size] = (time.perf_counter() - start) / repeat * 1000
+    return latencies
+
+
+def compare(reference, recognizer, crops):
+    """与参考识别器比较：logits最大误差与车牌号一致率"""
+    ims = reference.preprocess(crops)
+    ref_prebs, prebs = reference.forward(ims), recognizer.forward(ims)
+    ref_plates = labels_to_plates(greedy_decode(ref_prebs))
+    plates = labels_to_plates(greedy_decode(prebs))
+    agreement = np.mean([a == b for a, b in zip(ref_plates, plates)])
+    return float(np.abs(ref_prebs - prebs).max()), float(agreement)
+
+
+class ConstantRecognizer:
+    """每次返回相同车牌的模拟识别器（记录识别次数）"""
+    def __init__(self, confidence):
+        self.confidence = confidence
+        self.calls = 0
+
+    def read(self, crops):
+        self.calls += len(crops)
+        return [np.array([1, 2, 3, 4, 5, 6, 7])] * len(crops), [np.full(7, self.confidence)] * len(crops)
+
+##############################################################################################################################
+
+def export(args):
+    weights = args.weights or default_weights(args.configPath)
+    onnx_path = args.output or os.path.splitext(weights)[0] + '.onnx'
+    export_onnx(weights, onnx_path, args.opset)
+    print(f"已导出ONNX模型：{onnx_path}")
+    if args.openvino:
+        xml_path = os.path.splitext(onnx_path)[0] + '.xml'
+        export_openvino(onnx_path, xml_path)
+        print(f"已导出OpenVINO模型：{xml_path}")
+
+
+def benchmark(args):
+    weights = args.weights or default_weights(args.configPath)
+    crops = load_crops(args.crops)
+    backends = args.backends or [None] * len(args.models)
+    if len(backends) != len(args.models):
+        parser.error("--backends 的数量需与 --models 一致")
+
+    reference = PlateRecognizer(weights, args.device)
+    results = [(f"torch ({os.path.basename(weights)})", reference)]
+    for model_path, backend in zip(args.models, backends):
+        recognizer = PlateRecognizer(model_path, args.device, backend = backend)
+        results.append((f"{recognizer.backend.name} ({os.path.basename(model_path)})", recognizer))
+
+    print(f"车牌裁剪图：{len(crops)} 张")
+    for name, recognizer in results:
+        latencies = measure_latency(recognizer, crops, args.batchSizes, args.repeat)
+        latency_text = "，".join(f"batch={batch_size} {ms:.2f}ms" for batch_size, ms in latencies.items())
+        if recognizer is reference:
+            print(f"{name}：{latency_text}")
+            continue
+        max_error, agreement = compare(reference, recognizer, crops)
+        print(f"{name}：{latency_text}；logits最大误差 {max_error:.2e}，车牌号一致率 {agreement:.2%}")
+
+
+def quantize(args):
+    config = Config(args.configPath)
+    weights = args.weights or default_weights(args.configPath)
+    int8_path = args.output or Path(args.configPath).parent.joinpath(config.get('models', 'lprnet_int8_model')).as_posix()
+    crops, names = load_crops(args.crops, return_names = True)
+
+    # 校准集与评估集（图像不足时全部用于评估）
+    reference = PlateRecognizer(weights, 'cpu')
+    calibration_crops = crops[:args.calibrationCount]
+    eval_crops, eval_names = (crops[args.calibrationCount:], names[args.calibrationCount:]) if len(crops) > args.calibrationCount * 2 else (crops, names)
+    calibration = [reference.preprocess(calibration_crops[i:i + 32]).numpy() for i in range(0, len(calibration_crops), 32)]
+
+    excluded = quantize_lprnet(weights, int8_path, calibration, keep_fp32 = args.keepFp32)
+    print(f"已导出INT8模型：{int8_path}（保持FP32的卷积层：{', '.join(excluded) or '无'}）")
+
+    # 精度差异
+    quantized = PlateRecognizer(int8_path, 'cpu')
+    fp32_plates, int8_plates = recognize_all(reference, eval_crops), recognize_all(quantized, eval_crops)
+    print(f"评估图像：{len(eval_crops)} 张，INT8与FP32车牌号一致率 {np.mean([a == b for a, b in zip(fp32_plates, int8_plates)]):.2%}")
+    if args.labelsFromNames:
+        truths = [name.split('_')[0].split('.')[0] for name in eval_names]
+        fp32_accuracy = np.mean([a == b for a, b in zip(fp32_plates, truths)])
+        int8_accuracy = np.mean([a == b for a, b in zip(int8_plates, truths)])
+        print(f"识别准确率：FP32 {fp32_accuracy:.2%}，INT8 {int8_accuracy:.2%}，差异 {int8_accuracy - fp32_accuracy:+.2%}")
+
+    # 延迟
+    for name, recognizer in (("FP32", reference), ("INT8", quantized)):
+        latencies = measure_latency(recognizer, eval_crops, [1, 32], 10)
+        print(f"{name}：" + "，".join(f"batch={batch_size} {ms:.2f}ms" for batch_size, ms in latencies.items()))
+
+    if args.enable:
+        config.set('models', 'lprnet_precision', 'int8')
+        print("已在配置中启用INT8模式")
+
+
+def check_batch(args):
+    weights = args.weights or default_weights(args.configPath)
+    recognizer = PlateRecognizer(weights, args.device)
+    ims = recognizer.preprocess(load_crops(args.crops))
+
+    # 逐张识别作为基准
+    single = np.concatenate([recognizer.forward(ims[i:i + 1]) for i in range(len(ims))])
+    single_plates = labels_to_plates(greedy_decode(single))
+    passed = True
+    for batch_size in args.batchSizes:
+        batched = np.concatenate([recognizer.forward(ims[i:i + batch_size]) for i in range(0, len(ims), batch_size)])
+        error = float(np.abs(batched - single).max())
+        mismatches = sum(a != b for a, b in zip(single_plates, labels_to_plates(greedy_decode(batched))))
+        ok = error <= args.tolerance and mismatches == 0
+        passed &= ok
+        print(f"batch={batch_size}：logits最大误差 {error:.2e}，车牌号不一致 {mismatches} 张 {'通过' if ok else '失败'}")
+    if not passed:
+        raise SystemExit(1)
+
+
+def check_reader(args):
+    recognizer = ConstantRecognizer(args.confidence)
+    reader = PlateTrackReader(recognizer, voter = PlateVoter(max_reads = args.maxReads))
+    rng = np.random.default_rng(0)
+    img = rng.integers(0, 256, (240, 320, 3), dtype = np.uint8)
+    boxes = np.array([[20, 20, 114, 44], [150, 150, 244, 174]], dtype = np.float32)
+    class_ids = np.zeros(2, dtype = int)
+    passed = True
+
+    def report(name, ok, detail):
+        nonlocal passed
+        passed &= ok
+        print(f"{name}：{detail} {'通过' if ok else '失败'}")
+
+    # 目标静止：识别次数受缓存规则与上限约束
+    frame_id, events = 0, []
+    for frame_id in range(args.frames):
+        events += reader.update(img, boxes[:1], class_ids[:1], np.array([1]), frame_id)[3]
+    report("静止目标", recognizer.calls <= reader.voter.max_reads and not events, f"{args.frames}帧识别 {recognizer.calls} 次，事件 {len(events)} 个")
+
+    # 遮挡：只有另一辆车可见，超过缓存的消失帧数后目标重新出现（识别次数已达上限，缓存项已被清除）
+    for frame_id in range(frame_id + 1, frame_id + reader.cache.max_missing + 5):
+        events += reader.update(img, boxes[1:], class_ids[1:], np.array([2]), frame_id)[3]
+    try:
+        frame_id += 1
+        _, plate_ids, plates, frame_events = reader.update(img, boxes, class_ids, np.array([1, 2]), frame_id)
+        events += frame_events
+        report("遮挡后重新出现", True, f"目标 {plate_ids} 的车牌 {plates}")
+    except Exception as e:
+        report("遮挡后重新出现", False, repr(e))
+
+    # 消失：未确定的目标产生低置信度事件
+    for frame_id in range(frame_id + 1, frame_id + reader.voter.max_missing + 2):
+        events += reader.update(img, np.empty((0, 4)), np.empty(0, dtype = int), np.empty(0, dtype = int), frame_id)[3]
+    low_confidence = [event for event in events if event.low_confidence]
+    report("目标消失", len(low_confidence) == 2, f"低置信度事件 {low_confidence}")
+    if not passed:
+        raise SystemExit(1)
+
+##############################################################################################################################
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    {'export': export, 'benchmark': benchmark, 'quantize': quantize, 'check-batch': check_batch, 'check-reader': check_reader}[args.command](args)
+
+##############################################################################################################################
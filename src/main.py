@@ -1,17 +1,16 @@
 import sys
+import time
 import argparse
-import cv2
+import importlib
 import pyttsx3
 import PyEasyUtils as EasyUtils
 from pathlib import Path
-from collections import Counter
 from QEasyWidgets.Components import *
 #from QEasyWidgets.Windows import *
-from PySide6.QtWidgets import QMainWindow, QMessageBox, QFileDialog, QPushButton, QSpacerItem, QFrame, QHBoxLayout, QVBoxLayout, QGridLayout, QSizePolicy, QApplication
-from PySide6.QtCore import Qt, QTimer, QSize, QTime, QThreadPool
-from PySide6.QtGui import QImage, QPixmap, QFont, QIcon, QStandardItem
+from PySide6.QtWidgets import QMainWindow, QMessageBox, QFileDialog, QInputDialog, QPushButton, QSpacerItem, QFrame, QHBoxLayout, QVBoxLayout, QGridLayout, QSizePolicy, QApplication
+from PySide6.QtCore import Qt, QSize, QThreadPool
+from PySide6.QtGui import QImage, QPixmap, QFont, QIcon
 
-from core import *
 from utils import *
 from config import *
 from functions import *
@@ -19,6 +18,11 @@ from assets import *
 
 ##############################################################################################################################
 
+# 启动计时起点（用于统计界面显示、模型加载与首帧的耗时）
+startTime = time.perf_counter()
+
+##############################################################################################################################
+
 # Check whether python file is compiled
 _, isFileCompiled = EasyUtils.getFileInfo()
 
@@ -37,8 +41,6 @@ configPath = args.configPath
 ##############################################################################################################################
 
 class MainWindow(QMainWindow):
-    recognitionTime = 3000 # 计时器时长(ms)
-
     def __init__(self):
         super().__init__()
 
@@ -52,70 +54,88 @@ class MainWindow(QMainWindow):
         model_paths = self.config.get_model_paths()
         self.detect_model_path = Path(configPath).parent.joinpath(model_paths['yolo_model']).as_posix()
         self.lprnet_model_path = Path(configPath).parent.joinpath(model_paths['lprnet_model']).as_posix()
+        self.lprnet_device = model_paths.get('lprnet_device')
 
-        # 实例化yolo检测
-        self.yolo_predict = YoloPredictor(self.lprnet_model_path)
-        self.yolo_predict.new_model_name = self.detect_model_path
-        # 显示预测视频
-        #self.yolo_predict.yolo2main_trail_img.connect(lambda x: self.show_image(x, self.camera_label2))
-        self.yolo_predict.yolo2main_box_img.connect(lambda x: self.show_image(x, self.camera_label))
-        # 记录车牌信息
-        self.yolo_predict.yolo2main_plate.connect(lambda x: self.recognized_plates.append(x))
-        # 输出信息
-        self.yolo_predict.yolo2main_status_msg.connect(lambda x: print("状态信息:", x))
-        self.yolo_predict.yolo2main_fps.connect(lambda x: print("fps:", x))
+        # yolo检测（深度学习库与模型在窗口显示后于后台加载）
+        self.yolo_predict = None
 
         self.camera_active = False  # 添加摄像头状态标志
+        self.startup_times = {}  # 启动各阶段的耗时(s)
 
-        # 设置定时器更新显示
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_display)
-        self.timer.start(self.config.get('gui', 'refresh_rate'))
+    def load_models(self):
+        """
+        在后台导入深度学习库并加载模型，期间界面可正常操作（手动入场/出场）
+        """
+        self.loader = StartupLoader([
+            ('core', "正在加载深度学习库...", lambda results: importlib.import_module('core')),
+            ('lprnet', "正在加载车牌识别模型...", lambda results: results['core'].lprr.get_recognizer(self.lprnet_model_path, self.lprnet_device)),
+            ('yolo', "正在加载检测模型...", lambda results: results['core'].get_detector(self.detect_model_path)),
+        ], self)
+        self.loader.progress.connect(self.loading_progress)
+        self.loader.loaded.connect(self.models_loaded)
+        self.loader.failed.connect(lambda error: self.loading_progress(0, f"模型加载失败：{error}"))
+        self.loader.start(self.threadPool)
+
+    def loading_progress(self, value, text):
+        """
+        显示模型加载进度
+        """
+        self.loading_bar.setValue(value)
+        self.loading_bar.setFormat(text)
 
-        self.recognized_plates = []  # 存储识别到的车牌号
-        self.recognition_timer = QTimer()  # 用于计时
-        self.recognition_timer.timeout.connect(self.finalize_recognition)
-        self.start_time = None
+    def models_loaded(self, results):
+        """
+        模型加载完成后实例化yolo检测
+        """
+        core = results['core']
+        self.yolo_predict = core.YoloPredictor(self.lprnet_model_path, self.lprnet_device)
+        self.yolo_predict.new_model_name = self.detect_model_path
+        # 显示预测视频（每帧的结果合并为一个FrameResult，GUI来不及处理的帧被合并）
+        self.yolo_predict.yolo2main_result.connect(self.show_result)
+        # 车牌信息（每辆车投票确定后只发送一次）
+        self.yolo_predict.yolo2main_plate.connect(self.plate_recognized)
+        # 输出信息
+        self.yolo_predict.yolo2main_status_msg.connect(lambda x: print("状态信息:", x))
 
-    #主窗口显示轨迹图像和检测图像 （缩放在这里）
-    @staticmethod
-    def show_image(img_src, label):
+        self.startup_times.update({f'{name}_load': round(seconds, 3) for name, seconds in self.loader.timings.items()})
+        self.startup_times['models_ready'] = round(time.perf_counter() - startTime, 3)
+        self.loading_bar.hide()
+        self.camera_button.setEnabled(True)
+
+    #主窗口显示检测结果 （缩放与颜色转换在工作线程中完成）
+    def show_result(self):
         try:
-            # 检查图像的通道数，确定图像是否为彩色图像
-            if len(img_src.shape) == 3:
-                ih, iw, _ = img_src.shape
-            if len(img_src.shape) == 2:
-                ih, iw = img_src.shape
-            # 根据标签窗口的大小调整图像的大小
-            w = label.geometry().width()
-            h = label.geometry().height()
-            # 根据图像宽高比例进行缩放
-            if iw / w > ih / h:
-                scal = w / iw
-                nw = w
-                nh = int(scal * ih)
-                img_src_ = cv2.resize(img_src, (nw, nh))
-            else:
-                scal = h / ih
-                nw = int(scal * iw)
-                nh = h
-                img_src_ = cv2.resize(img_src, (nw, nh))
-            # 将OpenCV图像从BGR格式转换为RGB格式，并创建QImage对象
-            frame = cv2.cvtColor(img_src_, cv2.COLOR_BGR2RGB)
-            img = QImage(frame.data, frame.shape[1], frame.shape[0], frame.shape[2] * frame.shape[1],
-                         QImage.Format_RGB888)
-            # 在标签窗口中显示图像
-            label.setPixmap(QPixmap.fromImage(img))
+            # 同步显示区域大小，后续帧按新的大小缩放
+            self.yolo_predict.set_display_size('box', self.camera_label.width(), self.camera_label.height())
+            #self.yolo_predict.set_display_size('trail', self.camera_label2.width(), self.camera_label2.height())
+            # 取出最新的结果（GUI来不及处理的帧已被合并）
+            result = self.yolo_predict.take_result()
+            if result is None:
+                return
+            if result.fps is not None:
+                print("fps:", result.fps)
+            frame = (result.images or {}).get('box')
+            if frame is None:
+                return
+            if 'first_frame' not in self.startup_times:
+                self.startup_times['first_frame'] = round(time.perf_counter() - startTime, 3)
+                print("启动耗时(s):", self.startup_times)
+            self.show_image(frame, self.camera_label)
         except Exception as e:
             print(repr(e))
 
+    #在标签窗口中显示图像（RGB）
+    def show_image(self, frame, label):
+        img = QImage(frame.data, frame.shape[1], frame.shape[0], frame.strides[0], QImage.Format_RGB888)
+        label.setPixmap(QPixmap.fromImage(img))
+
     def toggle_camera(self):
         """
         切换摄像头状态
         """
         if not self.camera_active:
-            # 初始化摄像头
-            name, _ = QFileDialog.getOpenFileName(self, 'Video/image', filter = "Pic File(*.mp4 *.mkv *.avi *.flv *.jpg *.png)")
+            # 选择输入源
+            name = self.select_source()
             if not name:
                 return
             # 设置线程
@@ -125,48 +145,57 @@ class MainWindow(QMainWindow):
                 threadPool = self.threadPool,
             )
             self.yolo_predict.source = name
+            self.yolo_predict.set_display_size('box', self.camera_label.width(), self.camera_label.height())
             # 开始检测
             self.worker_yolo_predict.execute()
             # 开启摄像头
             self.camera_active = True
             self.camera_button.setText("关闭摄像头")
-            # 计时
-            self.recognition_timer.start(self.recognitionTime)
-            self.start_time = QTime.currentTime()
         else:
             # 关闭摄像头
             self.camera_active = False
-            self.recognition_timer.stop()
             self.worker_yolo_predict.terminate()
             self.camera_button.setText("开启摄像头")
             self.camera_label.clear()
-            self.recognized_plates.clear()
 
-    def finalize_recognition(self):
+    def select_source(self):
+        """
+        选择输入源（视频文件、摄像头或网络视频流）
+        """
+        sourceTypes = ["视频文件", "摄像头", "网络视频流(RTSP/HTTP)"]
+        sourceType, ok = QInputDialog.getItem(self, "输入源", "请选择输入源类型", sourceTypes, 0, False)
+        if not ok:
+            return None
+        if sourceType == sourceTypes[0]:
+            name, _ = QFileDialog.getOpenFileName(self, 'Video/image', filter = "Pic File(*.mp4 *.mkv *.avi *.flv *.mov *.jpg *.png)")
+            return name
+        if sourceType == sourceTypes[1]:
+            index, ok = QInputDialog.getInt(self, "摄像头", "请输入摄像头索引", 0, 0, 99)
+            return str(index) if ok else None
+        url, ok = QInputDialog.getText(self, "网络视频流", "请输入视频流地址（如 rtsp://...）")
+        return url.strip() if ok else None
+
+    def plate_recognized(self, plate):
         """
-        在若干秒后处理识别结果
+        处理投票确定的车牌号
         """
-        if self.recognized_plates:
-            # 选择出现次数最多的车牌号
-            most_common_plate = Counter(self.recognized_plates).most_common(1)[0][0]
-            self.recognized_plates.clear() # 重置计数
-            self.plate_input.setText(most_common_plate)
+        self.plate_input.setText(plate)
 
     def update_display(self):
         """
-        更新显示信息
+        更新状态标签（在场车辆表格由VehiclesTableModel按入场/出场事件增量更新）
         """
-        # 更新状态标签
         status = self.parking_lot.get_parking_status()
         self.total_spaces_label.setText(f"总车位：{status['total_spaces']}")
         self.available_spaces_label.setText(f"可用车位：{status['available_spaces']}")
 
-        # 更新在场车辆表格
-        current_vehicles = self.parking_lot.get_current_vehicles()
-        self.vehicles_table.setRowCount(len(current_vehicles))
-        for i, (_, vehicle) in enumerate(current_vehicles.iterrows()):
-            self.vehicles_table.setItem(i, 0, QStandardItem(vehicle['License Plate']))
-            self.vehicles_table.setItem(i, 1, QStandardItem(str(vehicle['Entry Time'])))
+    def closeEvent(self, event):
+        """
+        关闭窗口时确保停车记录落盘
+        """
+        self.vehicles_model.close()
+        self.parking_lot.close()
+        super().closeEvent(event)
 
     def speak(self, text):
         """
@@ -192,7 +221,6 @@ class MainWindow(QMainWindow):
             self.speak(f"{plate} 欢迎入场")  # 播报入场信息
         else:
             QMessageBox.warning(self, "失败", message)
-        self.update_display()
 
     def handle_exit(self):
         """
@@ -210,7 +238,6 @@ class MainWindow(QMainWindow):
             self.speak(f"{plate} 一路顺风")  # 播报出场信息
         else:
             QMessageBox.warning(self, "失败", message)
-        self.update_display()
 
     def show_message(self, message, success=True):
         """
@@ -356,8 +383,13 @@ class MainWindow(QMainWindow):
                 background-color: #D84315;
             }
         """)
+        self.camera_button.setEnabled(False)  # 模型加载完成后启用
+        self.loading_bar = ProgressBarBase()
+        self.loading_bar.setRange(0, 100)
+        self.loading_bar.setTextVisible(True)
         camera_layout = QVBoxLayout(camera_group)
         camera_layout.addWidget(self.camera_label)
+        camera_layout.addWidget(self.loading_bar)
         camera_layout.addWidget(self.camera_button)
         rightpLayout.addWidget(camera_group)
         # 在场车辆列表
@@ -380,6 +412,8 @@ class MainWindow(QMainWindow):
         self.vehicles_table.setColumnCount(2)
         self.vehicles_table.setHorizontalHeaderLabels(["车牌号", "入场时间"])
         self.vehicles_table.horizontalHeader().setStretchLastSection(True)
+        self.vehicles_model = VehiclesTableModel(self.vehicles_table, self.parking_lot, self)
+        self.vehicles_model.changed.connect(lambda event, record: self.update_display())
         vehicles_layout = QVBoxLayout(vehicles_group)
         vehicles_layout.addWidget(self.vehicles_table)
         rightpLayout.addWidget(vehicles_group)
@@ -467,6 +501,10 @@ class MainWindow(QMainWindow):
         menuButton_main.setChecked(False)
 
         self.show()
+        self.startup_times['window_shown'] = round(time.perf_counter() - startTime, 3)
+
+        # 窗口显示后再加载模型
+        self.load_models()
 
 ##############################################################################################################################
 
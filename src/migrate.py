@@ -0,0 +1,37 @@
+import os
+import argparse
+from pathlib import Path
+
+from utils import ParkingLot
+from database import SQLiteRecordStore
+
+##############################################################################################################################
+
+# 启动参数解析
+parser = argparse.ArgumentParser(description = "将CSV停车记录（快照与事务日志）导入SQLite数据库")
+parser.add_argument("--configPath", help = "配置路径", type = str, default = Path(__file__).parent.parent.joinpath('config.json').as_posix())
+parser.add_argument("--output", help = "数据库文件（默认使用配置中的data.database_file）", type = str, default = None)
+
+##############################################################################################################################
+
+def main(args):
+    # 读取CSV快照并重放事务日志
+    parking_lot = ParkingLot(args.configPath, backend = 'csv')
+    records = parking_lot.state.history()
+    parking_lot.close()
+
+    db_file = args.output or os.path.join('data', parking_lot.config.get('data', 'database_file') or 'parking_records.db')
+    store = SQLiteRecordStore(db_file)
+    if len(store.history()) > 0:
+        store.close()
+        raise SystemExit(f"数据库 {db_file} 中已有记录，请指定新的数据库文件")
+    count = store.import_records(records)
+    store.close()
+    print(f"已导入 {count} 条记录到 {db_file}")
+
+##############################################################################################################################
+
+if __name__ == '__main__':
+    main(parser.parse_args())
+
+##############################################################################################################################
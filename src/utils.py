@@ -5,6 +5,8 @@ import pandas as pd
 from datetime import datetime, timedelta
 
 from config import *
+from journal import *
+from database import *
 
 ##############################################################################################################################
 
@@ -27,45 +29,194 @@ def check_url(img_url: str):
 
 ##############################################################################################################################
 
+class ParkingState:
+    """
+    停车状态
+    在场车辆按车牌建立哈希索引（车牌 -> 未结束的停车记录），车位占用O(1)计数；
+    历史记录只追加，仅在生成报表时转换为DataFrame
+    """
+    columns = ['License Plate', 'Entry Time', 'Exit Time', 'Fee']
+
+    def __init__(self, records=None):
+        self._history = [] # 全部停车记录（只追加）
+        self._sessions = {} # 车牌 -> 在场车辆的停车记录
+        self._frame = None # 历史记录的DataFrame缓存
+        for record in records or []:
+            self._append(record)
+
+    def _append(self, record):
+        self._history.append(record)
+        if pd.isna(record['Exit Time']):
+            self._sessions[record['License Plate']] = record
+        self._frame = None
+
+    @property
+    def occupied(self):
+        """在场车辆数"""
+        return len(self._sessions)
+
+    def is_parked(self, plate):
+        """车辆是否在场"""
+        return plate in self._sessions
+
+    def get_session(self, plate):
+        """获取车辆未结束的停车记录"""
+        return self._sessions.get(plate)
+
+    def open_session(self, plate, entry_time):
+        """记录入场"""
+        record = {
+            'License Plate': plate,
+            'Entry Time': entry_time,
+            'Exit Time': pd.NaT,
+            'Fee': 0.0
+        }
+        self._append(record)
+        return record
+
+    def close_session(self, plate, exit_time, fee):
+        """记录出场"""
+        record = self._sessions.pop(plate)
+        record['Exit Time'] = exit_time
+        record['Fee'] = fee
+        self._frame = None
+        return record
+
+    def current_sessions(self):
+        """在场车辆的停车记录"""
+        return list(self._sessions.values())
+
+    def history(self):
+        """全部停车记录"""
+        return self._history
+
+    def to_dataframe(self, records=None):
+        """转换为DataFrame（不指定records时为全部历史记录，结果缓存到下次修改）"""
+        if records is not None:
+            return pd.DataFrame(records, columns=self.columns)
+        if self._frame is None:
+            self._frame = pd.DataFrame(self._history, columns=self.columns)
+            # 确保时间列的格式正确（只在缓存重建时转换一次）
+            for col in ['Entry Time', 'Exit Time']:
+                self._frame[col] = pd.to_datetime(self._frame[col])
+        return self._frame
+
+    def query(self, start_time, end_time, plate=None):
+        """查询入场时间在[start_time, end_time)内的记录"""
+        records = self.to_dataframe()
+        mask = (records['Entry Time'] >= start_time) & (records['Entry Time'] < end_time)
+        if plate:
+            mask = mask & (records['License Plate'] == plate)
+        return records[mask].copy()
+
+
 class ParkingLot:
-    def __init__(self, configPath):
+    def __init__(self, configPath, backend=None):
         self.config = Config(configPath)
         self.total_spaces = self.config.get('parking_lot', 'total_spaces')
         self.hourly_rate = self.config.get('parking_lot', 'hourly_rate')
 
-        # 初始化可用车位数量
-        self.available_spaces = self.total_spaces
-
         # 初始化闸门状态
         self.gate_status = "closed"
 
+        # 车辆入场/出场事件的监听者
+        self._listeners = []
+
         # 创建数据目录
         os.makedirs('data', exist_ok=True)
 
-        # 数据文件路径
+        # 数据文件路径（快照 + 追加写入的事务日志）
         self.data_file = os.path.join('data', 'parking_records.csv')
-
-        # 初始化或加载数据
+        self.journal_file = os.path.join('data', 'parking_records.journal')
+        self.compact_every = 1000 # 日志每累积多少条记录合并进快照
+
+        # 存储后端（csv: 内存索引 + CSV快照与事务日志；sqlite: SQLite数据库）
+        self.backend = backend or self.config.get('data', 'backend') or 'csv'
+        if self.backend == 'sqlite':
+            self.db_file = os.path.join('data', self.config.get('data', 'database_file') or 'parking_records.db')
+            self.state = SQLiteRecordStore(self.db_file)
+            self.journal = None
+            return
+
+        # 初始化或加载数据（快照）
         if os.path.exists(self.data_file):
-            self.records = pd.read_csv(self.data_file)
+            records = pd.read_csv(self.data_file)
             # 确保时间列的格式正确
             for col in ['Entry Time', 'Exit Time']:
-                if col in self.records.columns:
-                    self.records[col] = pd.to_datetime(self.records[col])
-            # 更新可用车位
-            current_parked = len(self.records[self.records['Exit Time'].isna()])
-            self.available_spaces = self.total_spaces - current_parked
+                if col in records.columns:
+                    records[col] = pd.to_datetime(records[col])
+            self.state = ParkingState(records.to_dict('records'))
         else:
-            self.records = pd.DataFrame(columns=[
-                'License Plate', 'Entry Time', 'Exit Time', 'Fee'
-            ])
+            self.state = ParkingState()
             self._save_records()
 
+        # 重放快照之后的事务日志
+        self.journal = Journal(self.journal_file)
+        if self.journal.count > 0:
+            self._replay_journal()
+            self.compact()
+
+    def _replay_journal(self):
+        """重放事务日志（快照中已包含的记录会被跳过，重放是幂等的）"""
+        known = {(record['License Plate'], pd.Timestamp(record['Entry Time'])) for record in self.state.history()}
+        for record in self.journal.replay():
+            plate = record['plate']
+            entry_time = pd.Timestamp(record['entry_time'])
+            if record['op'] == 'entry':
+                if (plate, entry_time) not in known and not self.state.is_parked(plate):
+                    self.state.open_session(plate, entry_time)
+                    known.add((plate, entry_time))
+            elif record['op'] == 'exit':
+                session = self.state.get_session(plate)
+                if session is not None and pd.Timestamp(session['Entry Time']) == entry_time:
+                    self.state.close_session(plate, pd.Timestamp(record['exit_time']), record['fee'])
+
+    def _journal(self, record):
+        """写入事务日志，累积到一定数量后合并进快照"""
+        if self.journal is None: # SQLite后端自身保证持久化
+            return
+        self.journal.append(record)
+        if self.journal.count >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """将当前状态写入快照并清空事务日志"""
+        self._save_records()
+        self.journal.truncate()
+
+    def close(self):
+        """关闭事务日志或数据库（确保已写入的记录落盘）"""
+        if self.journal is not None:
+            self.journal.close()
+        else:
+            self.state.close()
+
+    def add_listener(self, callback):
+        """注册车辆变动监听者，入场/出场后以callback(event, record)通知（event为'entry'或'exit'）"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, event, record):
+        for callback in list(self._listeners):
+            callback(event, dict(record))
+
+    @property
+    def records(self):
+        """全部停车记录（DataFrame，用于报表）"""
+        return self.state.to_dataframe()
+
+    @property
+    def available_spaces(self):
+        """可用车位数量"""
+        return self.total_spaces - self.state.occupied
+
     def update_prices(self, normal_price):
         """更新价格设置"""
         self.hourly_rate = normal_price
         self.config.set('parking_lot', 'hourly_rate', normal_price)
-        self.config._save_config()
 
     def calculate_fee(self, entry_time, exit_time, plate):
         """计算停车费用
@@ -81,12 +232,10 @@ class ParkingLot:
         return round(hours * self.hourly_rate, 2)
 
     def _save_records(self):
-        """保存记录到CSV文件"""
+        """保存记录到CSV文件（快照，原子替换）"""
         os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
-        self.records.to_csv(self.data_file, index=False)
-        # 保存价格到配置文件
-        self.config.set('parking_lot', 'hourly_rate', self.hourly_rate)
-        self.config._save_config()
+        records = self.records
+        write_atomic(self.data_file, lambda f: records.to_csv(f, index=False))
 
     def validate_license_plate(self, plate):
         """验证车牌号格式"""
@@ -94,8 +243,7 @@ class ParkingLot:
         return bool(re.match(pattern, plate))
 
     def check_duplicate_entry(self, plate):
-        current_vehicles = self.records[self.records['Exit Time'].isna()]
-        return plate in current_vehicles['License Plate'].values
+        return self.state.is_parked(plate)
 
     def get_parking_status(self):
         """获取停车场状态"""
@@ -107,7 +255,7 @@ class ParkingLot:
 
     def get_current_vehicles(self):
         """获取当前在场车辆"""
-        return self.records[self.records['Exit Time'].isna()]
+        return self.state.to_dataframe(self.state.current_sessions())
 
     def process_entry(self, plate):
         """处理车辆入场"""
@@ -119,61 +267,51 @@ class ParkingLot:
             return False, "停车场已满"
 
         # 检查车辆是否已在场内
-        if len(self.records[
-            (self.records['License Plate'] == plate) &
-            (self.records['Exit Time'].isna())
-        ]) > 0:
+        if self.state.is_parked(plate):
             return False, "该车辆已在停车场内"
 
         # 记录入场
         entry_time = datetime.now()
-        new_record = pd.DataFrame({
-            'License Plate': [plate],
-            'Entry Time': [entry_time],
-            'Exit Time': [pd.NA],
-            'Fee': [0.0]
+        record = self.state.open_session(plate, entry_time)
+        self._journal({
+            'op': 'entry',
+            'plate': plate,
+            'entry_time': entry_time.isoformat()
         })
-
-        # 确保数据类型一致
-        if len(self.records) > 0:
-            new_record = new_record.astype(self.records.dtypes)
-
-        self.records = pd.concat([self.records, new_record], ignore_index=True)
-        self.available_spaces -= 1
-        self._save_records()
+        self._notify('entry', record)
 
         return True, f"车辆 {plate} 已成功入场"
 
     def process_exit(self, plate):
         """处理车辆出场"""
         # 查找未出场的记录
-        current_record = self.records[
-            (self.records['License Plate'] == plate) &
-            (self.records['Exit Time'].isna())
-        ]
+        current_record = self.state.get_session(plate)
 
-        if len(current_record) == 0:
+        if current_record is None:
             return False, "未找到该车辆的入场记录"
 
         # 记录出场时间和计费
         exit_time = datetime.now()
-        entry_time = current_record.iloc[0]['Entry Time']
+        entry_time = current_record['Entry Time']
         fee = self.calculate_fee(entry_time, exit_time, plate)
 
         # 更新记录
-        self.records.loc[current_record.index, 'Exit Time'] = exit_time
-        self.records.loc[current_record.index, 'Fee'] = fee
-        self.available_spaces += 1
-        self._save_records()
+        record = self.state.close_session(plate, exit_time, fee)
+        self._journal({
+            'op': 'exit',
+            'plate': plate,
+            'entry_time': pd.Timestamp(entry_time).isoformat(),
+            'exit_time': exit_time.isoformat(),
+            'fee': fee
+        })
+        self._notify('exit', record)
 
         return True, f"车辆 {plate} 已出场，费用：{fee}元"
 
     def get_records_by_date(self, date):
         """获取指定日期的记录，用于报表生成"""
-        date_records = self.records[
-            pd.to_datetime(self.records['Entry Time']).dt.date == date
-        ]
-        return date_records
+        start_datetime = pd.Timestamp(date)
+        return self.state.query(start_datetime, start_datetime + timedelta(days=1))
 
     def get_records_by_date_range(self, start_date, end_date, plate=None):
         """获取指定日期范围内的记录
@@ -188,15 +326,8 @@ class ParkingLot:
         start_datetime = pd.Timestamp(start_date)
         end_datetime = pd.Timestamp(end_date) + timedelta(days=1)  # 包含结束日期
 
-        # 筛选日期范围内的记录
-        mask = (pd.to_datetime(self.records['Entry Time']) >= start_datetime) & \
-               (pd.to_datetime(self.records['Entry Time']) < end_datetime)
-
-        if plate:
-            # 如果指定了车牌号，添加车牌过滤条件
-            mask = mask & (self.records['License Plate'] == plate)
-
-        filtered_records = self.records[mask].copy()
+        # 筛选日期范围内的记录（SQLite后端在SQL中完成）
+        filtered_records = self.state.query(start_datetime, end_datetime, plate)
         return filtered_records.to_dict('records')
 
-##############################################################################################################################
\ No newline at end of file
+##############################################################################################################################